@@ -5,5 +5,10 @@
 
 from .file_handler import FileHandler
 from .image_processor import ImageProcessor
+from .font_registry import FontRegistry
+from .watermark_renderer import WatermarkRenderer, RenderPlan
+from .image_cache import ImageCache
+from .alpha_blend import BlendBackendSelector
 
-__all__ = ['FileHandler', 'ImageProcessor']
\ No newline at end of file
+__all__ = ['FileHandler', 'ImageProcessor', 'FontRegistry', 'WatermarkRenderer', 'RenderPlan', 'ImageCache',
+           'BlendBackendSelector']
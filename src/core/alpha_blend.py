@@ -0,0 +1,228 @@
+# src/core/alpha_blend.py
+"""
+水印合成后端
+
+水印图层（RGBA，非预乘alpha）与目标图片相交的区域有两种合成方式：
+    pil: Image.paste带蒙版或alpha_composite，全部在Pillow的C代码中完成
+    numpy: 将区域取为数组后用整数运算原地混合（可选，需要安装NumPy）
+
+两者的快慢与区域大小和机器有关，默认在首次合成某种模式的图片时
+对几个典型尺寸分别计时，之后按区域面积选择较快的后端。
+
+环境变量:
+    PHOTO_WATERMARK_BLEND_BACKEND: auto（默认）、pil 或 numpy
+"""
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from src.utils.logger import get_logger
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = get_logger(__name__)
+
+BLEND_BACKEND_ENV = 'PHOTO_WATERMARK_BLEND_BACKEND'
+BACKENDS = ('pil', 'numpy')
+# 自动选择时计时的正方形区域边长（更大的区域沿用最大档位的结果，控制计时开销）
+BENCHMARK_SIDES = (64, 256, 512)
+BENCHMARK_REPEAT = 2
+# NumPy后端支持的目标模式
+NUMPY_MODES = ('RGB', 'RGBA', 'L')
+
+
+def _div255(values):
+    """原地计算 round(values / 255)，values为无符号整数数组且已包含 +128 的舍入项"""
+    values += values >> 8
+    values >>= 8
+    return values
+
+
+def blend_into(dst, src) -> None:
+    """
+    将RGBA水印数组原地混合到目标数组上，只使用整数运算
+
+    dst可以是大图数组中任意步长的子区域视图，结果直接写回该视图。
+
+    Args:
+        dst: uint8数组，形状为(H, W)（L）、(H, W, 3)（RGB）或(H, W, 4)（RGBA）
+        src: uint8数组，形状为(H, W, 4)，非预乘alpha
+    """
+    if dst.ndim == 3 and dst.shape[2] == 4:
+        _blend_over_alpha(dst, src)
+        return
+
+    alpha = src[..., 3].astype(np.uint16)
+    if dst.ndim == 2:
+        # 与PIL的RGB转L相同的亮度公式（ITU-R 601-2）
+        # 先转为uint32再加权：NumPy 1.x按数值推断类型，uint8乘标量只会提升到uint16而溢出
+        channels = src[..., :3].astype(np.uint32)
+        color = channels[..., 0] * 299
+        color += channels[..., 1] * 587
+        color += channels[..., 2] * 114
+        color += 500
+        color //= 1000
+        mixed = color.astype(np.uint16)
+    else:
+        alpha = alpha[..., None]
+        mixed = src[..., :3].astype(np.uint16)
+
+    # 不透明目标: dst = round((src * a + dst * (255 - a)) / 255)，最大值不超过uint16
+    mixed *= alpha
+    inverse = np.subtract(255, alpha, dtype=np.uint16)
+    background = dst.astype(np.uint16)
+    background *= inverse
+    mixed += background
+    mixed += 128
+    dst[...] = _div255(mixed)
+
+
+def _blend_over_alpha(dst, src) -> None:
+    """带透明通道的目标：与Image.alpha_composite相同的source-over合成"""
+    src_alpha = src[..., 3].astype(np.uint32)
+    # 目标alpha中未被水印遮挡的部分: dst_a * (255 - src_a) / 255
+    dst_alpha = dst[..., 3].astype(np.uint32)
+    dst_alpha *= 255 - src_alpha
+    dst_alpha += 128
+    _div255(dst_alpha)
+    out_alpha = src_alpha + dst_alpha
+
+    # 颜色按两者的有效alpha加权，再除以合成后的alpha（四舍五入）
+    color = src[..., :3] * src_alpha[..., None]
+    color += dst[..., :3] * dst_alpha[..., None]
+    color += (out_alpha >> 1)[..., None]
+    color //= np.maximum(out_alpha, 1)[..., None]
+
+    dst[..., :3] = color
+    dst[..., 3] = out_alpha
+
+
+def _blend_pil(image: Image.Image, stamp: Image.Image, position: Tuple[int, int]) -> None:
+    """Pillow后端"""
+    if image.mode == 'RGBA':
+        # 带透明通道的目标需要完整的alpha合成
+        image.alpha_composite(stamp, position)
+    else:
+        # 不透明目标上，以水印alpha为蒙版粘贴即等价于alpha合成
+        image.paste(stamp, position, stamp)
+
+
+def _blend_numpy(image: Image.Image, stamp: Image.Image, position: Tuple[int, int]) -> None:
+    """NumPy后端：PIL不暴露内部缓冲区，区域先复制为数组，混合后再贴回"""
+    box = (position[0], position[1], position[0] + stamp.width, position[1] + stamp.height)
+    region = np.array(image.crop(box))
+    blend_into(region, np.asarray(stamp))
+    image.paste(Image.fromarray(region), box)
+
+
+_BLEND_FUNCTIONS = {'pil': _blend_pil, 'numpy': _blend_numpy}
+
+
+class BlendBackendSelector:
+    """
+    按目标模式与区域面积选择合成后端
+
+    自动模式下，每种目标模式第一次合成时计时一次，结果在进程内复用。
+    """
+
+    def __init__(self, preference: Optional[str] = None):
+        """
+        Args:
+            preference: auto、pil 或 numpy，为None时读取环境变量PHOTO_WATERMARK_BLEND_BACKEND
+        """
+        if preference is None:
+            preference = os.environ.get(BLEND_BACKEND_ENV) or 'auto'
+        preference = preference.strip().lower()
+        if preference not in BACKENDS + ('auto',):
+            logger.warning("未知的合成后端 %s，改为自动选择", preference)
+            preference = 'auto'
+        if preference != 'pil' and np is None:
+            if preference == 'numpy':
+                logger.warning("未安装NumPy，改用PIL合成")
+            preference = 'pil'
+        self.preference = preference
+        # 目标模式 -> [(区域面积, 较快的后端), ...]，按面积升序
+        self._timings: Dict[str, List[Tuple[int, str]]] = {}
+        self._lock = threading.Lock()
+
+    def choose(self, mode: str, area: int) -> str:
+        """
+        选择合成后端
+
+        Args:
+            mode: 目标图片模式
+            area: 合成区域的像素数
+
+        Returns:
+            str: 'pil' 或 'numpy'
+        """
+        if self.preference != 'auto' or mode not in NUMPY_MODES:
+            return self.preference if mode in NUMPY_MODES else 'pil'
+        timings = self._timings.get(mode)
+        if timings is None:
+            with self._lock:
+                timings = self._timings.get(mode)
+                if timings is None:
+                    timings = self._timings[mode] = self.benchmark(mode)
+        # 取不大于该面积的最大计时档位，小于所有档位时取最小档位
+        backend = timings[0][1]
+        for bench_area, faster in timings:
+            if bench_area > area:
+                break
+            backend = faster
+        return backend
+
+    @staticmethod
+    def benchmark(mode: str) -> List[Tuple[int, str]]:
+        """
+        对各典型尺寸分别计时两种后端
+
+        Args:
+            mode: 目标图片模式
+
+        Returns:
+            List[Tuple[int, str]]: [(区域面积, 较快的后端), ...]
+        """
+        results = []
+        for side in BENCHMARK_SIDES:
+            image = Image.new(mode, (side, side), 128)
+            # 带渐变透明度的水印，覆盖全透明、半透明和不透明像素
+            stamp = Image.new('RGBA', (side, side), (255, 255, 255, 0))
+            stamp.putalpha(Image.linear_gradient('L').resize((side, side)))
+            elapsed = {}
+            for name in BACKENDS:
+                blend = _BLEND_FUNCTIONS[name]
+                best = None
+                for _ in range(BENCHMARK_REPEAT):
+                    start = time.perf_counter()
+                    blend(image, stamp, (0, 0))
+                    duration = time.perf_counter() - start
+                    best = duration if best is None else min(best, duration)
+                elapsed[name] = best
+            faster = min(BACKENDS, key=elapsed.get)
+            results.append((side * side, faster))
+            logger.debug("合成后端计时 %s %dx%d: pil %.2fms, numpy %.2fms -> %s", mode, side, side,
+                         elapsed['pil'] * 1000, elapsed['numpy'] * 1000, faster)
+        return results
+
+    def blend(self, image: Image.Image, stamp: Image.Image, position: Tuple[int, int]) -> None:
+        """
+        将水印图层原地合成到图片上（水印图层须完全位于图片内）
+
+        Args:
+            image: 目标图像（RGB、RGBA或L），会被直接修改
+            stamp: RGBA水印图层
+            position: 水印图层左上角在图片中的坐标
+        """
+        backend = self.choose(image.mode, stamp.width * stamp.height)
+        _BLEND_FUNCTIONS[backend](image, stamp, position)
+
+
+# 进程内共享的合成后端选择器
+BLEND_BACKEND = BlendBackendSelector()
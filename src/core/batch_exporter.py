@@ -0,0 +1,305 @@
+# src/core/batch_exporter.py
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from .file_handler import FileHandler
+from .image_probe import probe_image
+from .image_processor import ImageProcessor
+from .watermark_renderer import WatermarkRenderer
+from src.utils.logger import ROOT_LOGGER_NAME, get_logger, setup_logging
+
+
+class ExportTask(NamedTuple):
+    """单张图片的导出任务"""
+    image_path: str
+    output_path: str
+
+
+class BatchEstimate(NamedTuple):
+    """导出前根据文件头估算的工作量"""
+    count: int
+    rejected: int
+    megapixels: float
+    # 所有工作进程同时处理最大图片时的内存峰值估算（字节）
+    peak_memory: int
+
+
+class ExportResult(NamedTuple):
+    """单张图片的导出结果"""
+    image_path: str
+    output_path: str
+    success: bool
+    error: Optional[str]
+    elapsed: float
+
+
+# 工作进程内编译好的渲染器，由进程池初始化函数创建，同一进程内所有任务共用
+_worker_renderer = None
+_worker_export_settings = None
+
+
+def _init_worker(watermark_settings: Dict[str, Any], export_settings: Dict[str, Any], log_level: int) -> None:
+    """进程池初始化函数：每个工作进程只接收并编译一次设置"""
+    global _worker_renderer, _worker_export_settings
+    # 子进程使用与主进程相同的日志级别，并建立自己的后台输出线程
+    setup_logging(log_level)
+    _worker_renderer = WatermarkRenderer(watermark_settings)
+    _worker_export_settings = export_settings
+
+
+def _run_in_worker(task: ExportTask) -> ExportResult:
+    """在工作进程中执行导出任务"""
+    return export_image(task, _worker_renderer, _worker_export_settings)
+
+
+def export_image(task: ExportTask, renderer: WatermarkRenderer, export_settings: Dict[str, Any]) -> ExportResult:
+    """
+    导出单张图片：加载、调整尺寸、添加水印、保存
+
+    先缩放到输出尺寸再添加水印，水印的字号、描边和间距按同样的比例缩放，
+    效果与在原图上添加水印后再缩放一致，但只需处理输出尺寸的像素。
+
+    Args:
+        task: 导出任务
+        renderer: 已编译好设置的水印渲染器
+        export_settings: 导出设置（format, quality, resize_type, width, height, percent）
+
+    Returns:
+        ExportResult: 导出结果，出错时不抛出异常而是记录在结果中
+    """
+    start = time.perf_counter()
+    try:
+        image = ImageProcessor.load_image(task.image_path)
+        if image is None:
+            raise IOError(f"无法加载图片: {task.image_path}")
+
+        with image:
+            output_size = ImageProcessor.get_output_size(
+                image.size,
+                resize_type=export_settings.get('resize_type', 'original'),
+                width=export_settings.get('width'),
+                height=export_settings.get('height'),
+                percent=export_settings.get('percent')
+            )
+            if min(output_size) <= 0:
+                raise ValueError(f"无效的输出尺寸: {output_size[0]}x{output_size[1]}")
+            scale = output_size[0] / image.width
+            resized = ImageProcessor.resize_for_output(image, output_size, renderer.output_mode(image))
+            watermarked = renderer.rescaled(scale).render(resized)
+
+        success = ImageProcessor.save_image(
+            watermarked, task.output_path,
+            export_settings.get('format', 'PNG').upper(),
+            export_settings.get('quality', 90))
+        error = None if success else f"保存图片失败: {task.output_path}"
+    except Exception as e:
+        success = False
+        error = f"{type(e).__name__}: {e}"
+    return ExportResult(task.image_path, task.output_path, success, error, time.perf_counter() - start)
+
+
+class BatchExporter:
+    """
+    批量导出引擎
+
+    将图片分发到进程池并行处理，每个工作进程只编译一次水印设置，
+    导出结果按完成顺序逐个返回。与Qt无关，可在命令行中使用。
+    """
+
+    def __init__(self, watermark_settings: Dict[str, Any], export_settings: Dict[str, Any],
+                 output_dir: str, max_workers: Optional[int] = None):
+        """
+        Args:
+            watermark_settings: 水印设置字典
+            export_settings: 导出设置字典（format, quality, naming_rule, prefix, suffix, resize_type...）
+            output_dir: 输出目录
+            max_workers: 工作进程数，默认等于CPU核心数；为1时在当前进程内顺序处理
+
+        Raises:
+            ValueError: 图片水印未指定图片文件
+            IOError: 水印图片无法加载
+        """
+        # 水印本身有问题时每张图片都会失败，在开始导出前直接报错
+        WatermarkRenderer.validate(watermark_settings)
+        self.watermark_settings = dict(watermark_settings)
+        self.export_settings = dict(export_settings)
+        self.output_dir = output_dir
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        """
+        请求取消导出：不再开始新的图片，正在处理的图片完成后停止
+
+        可以在其他线程中调用。
+        """
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """是否已请求取消"""
+        return self._cancel_event.is_set()
+
+    def iter_tasks(self, image_paths: Iterable[str]) -> Iterator[ExportTask]:
+        """
+        逐个为图片生成输出路径，可以直接消费扫描中的路径生成器
+
+        输出扩展名与导出格式一致；不同文件夹下的同名图片会自动添加序号，避免互相覆盖。
+
+        Args:
+            image_paths: 图片路径的可迭代对象
+
+        Yields:
+            ExportTask: 导出任务
+        """
+        ext = '.jpg' if self.export_settings.get('format', 'PNG').upper() in ('JPEG', 'JPG') else '.png'
+        used = set()
+        for image_path in image_paths:
+            output_path = FileHandler.generate_output_filename(
+                image_path, self.output_dir,
+                self.export_settings.get('naming_rule', 'suffix'),
+                self.export_settings.get('prefix', 'wm_'),
+                self.export_settings.get('suffix', '_watermark'))
+            base_name = os.path.splitext(output_path)[0]
+            output_path = base_name + ext
+            counter = 1
+            while os.path.normcase(output_path) in used:
+                output_path = f"{base_name}_{counter}{ext}"
+                counter += 1
+            used.add(os.path.normcase(output_path))
+            yield ExportTask(image_path, output_path)
+
+    def estimate(self, image_paths: Iterable[str]) -> BatchEstimate:
+        """
+        根据文件头估算导出工作量，不解码图片
+
+        Args:
+            image_paths: 图片路径的可迭代对象
+
+        Returns:
+            BatchEstimate: 可处理的图片数、被拒绝的图片数、总像素数(百万)和内存峰值估算
+        """
+        count = rejected = 0
+        total_pixels = 0
+        largest = 0
+        for image_path in image_paths:
+            info = probe_image(image_path)
+            if not info.ok:
+                rejected += 1
+                continue
+            count += 1
+            total_pixels += info.width * info.height
+            largest = max(largest, info.decoded_bytes)
+        # 每张图片同时存在原图与带水印的副本
+        peak_memory = largest * 2 * min(self.max_workers, max(1, count))
+        return BatchEstimate(count, rejected, total_pixels / 1e6, peak_memory)
+
+    def plan_tasks(self, image_paths: Iterable[str]) -> List[ExportTask]:
+        """
+        为每张图片生成输出路径
+
+        Args:
+            image_paths: 图片路径的可迭代对象
+
+        Returns:
+            List[ExportTask]: 导出任务列表
+        """
+        return list(self.iter_tasks(image_paths))
+
+    @staticmethod
+    def _reject(task: ExportTask) -> Optional[ExportResult]:
+        """检查图片文件头，无法处理时返回失败结果，可以处理时返回None"""
+        info = probe_image(task.image_path)
+        if info.ok:
+            return None
+        return ExportResult(task.image_path, task.output_path, False, info.error, 0.0)
+
+    def iter_results(self, image_paths: Iterable[str]) -> Iterator[ExportResult]:
+        """
+        执行导出，按完成顺序逐个产出结果
+
+        Args:
+            image_paths: 图片路径列表，也可以是扫描中的路径生成器（边扫描边导出）
+
+        Yields:
+            ExportResult: 每张图片的导出结果；调用cancel()后只产出已在处理中的图片
+        """
+        # 路径数量已知时，不启动多于图片数量的工作进程
+        workers = self.max_workers
+        if hasattr(image_paths, '__len__'):
+            workers = min(workers, len(image_paths))
+        if workers <= 0:
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        tasks = self.iter_tasks(image_paths)
+        if workers == 1:
+            renderer = WatermarkRenderer(self.watermark_settings)
+            for task in tasks:
+                if self.cancelled:
+                    return
+                rejection = self._reject(task)
+                yield rejection or export_image(task, renderer, self.export_settings)
+            return
+
+        # 界面进程中有多个线程持有锁，fork出的子进程可能继承被占用的锁而死锁，
+        # 因此所有平台都用spawn启动工作进程
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker,
+                                 initargs=(self.watermark_settings, self.export_settings,
+                                           get_logger(ROOT_LOGGER_NAME).getEffectiveLevel())) as executor:
+            # 限制同时提交的任务数，避免一次性为上万张图片创建Future
+            pending = {}
+            # 文件头检查未通过的图片不提交到进程池，直接返回失败结果
+            rejected = []
+
+            def submit_more():
+                if self.cancelled:
+                    return
+                for task in tasks:
+                    rejection = self._reject(task)
+                    if rejection is not None:
+                        rejected.append(rejection)
+                        continue
+                    pending[executor.submit(_run_in_worker, task)] = task
+                    if len(pending) >= workers * 2:
+                        break
+
+            submit_more()
+            while pending or rejected:
+                while rejected:
+                    yield rejected.pop(0)
+                if not pending:
+                    break
+                if self.cancelled:
+                    # 撤销尚未开始的任务，已在处理中的任务继续完成
+                    for future in list(pending):
+                        if future.cancel():
+                            del pending[future]
+                    if not pending:
+                        break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = pending.pop(future)
+                    try:
+                        yield future.result()
+                    except Exception as e:
+                        # 工作进程异常退出等情况
+                        yield ExportResult(task.image_path, task.output_path, False,
+                                           f"{type(e).__name__}: {e}", 0.0)
+                submit_more()
+
+    def run(self, image_paths: Iterable[str]) -> List[ExportResult]:
+        """
+        执行导出并返回全部结果
+
+        Args:
+            image_paths: 图片路径的可迭代对象
+
+        Returns:
+            List[ExportResult]: 导出结果列表（按完成顺序）
+        """
+        return list(self.iter_results(image_paths))
@@ -1,7 +1,11 @@
 # src/core/file_handler.py
 import os
-from typing import List, Tuple, Optional
+from typing import Iterator, List, Tuple, Optional
 from PIL import Image
+from .folder_scanner import scan_images
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class FileHandler:
     """
@@ -25,6 +29,19 @@ class FileHandler:
         ext = os.path.splitext(file_path)[1].lower()
         return ext in FileHandler.SUPPORTED_IMAGE_FORMATS
     
+    @staticmethod
+    def iter_images_from_folder(folder_path: str) -> Iterator[str]:
+        """
+        递归查找文件夹中所有支持的图片，边扫描边产出（子目录并行扫描）
+        
+        Args:
+            folder_path: 文件夹路径
+            
+        Yields:
+            str: 图片文件路径
+        """
+        return scan_images(folder_path, FileHandler.SUPPORTED_IMAGE_FORMATS)
+    
     @staticmethod
     def get_images_from_folder(folder_path: str) -> List[str]:
         """
@@ -36,18 +53,7 @@ class FileHandler:
         Returns:
             List[str]: 图片文件路径列表
         """
-        image_paths = []
-        
-        if not os.path.isdir(folder_path):
-            return image_paths
-        
-        for root, _, files in os.walk(folder_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                if FileHandler.is_supported_image(file_path):
-                    image_paths.append(file_path)
-        
-        return image_paths
+        return list(FileHandler.iter_images_from_folder(folder_path))
     
     @staticmethod
     def save_image(image: Image.Image, output_path: str, format: Optional[str] = None, quality: int = 95) -> bool:
@@ -66,7 +72,7 @@ class FileHandler:
         try:
             # 确保路径为字符串类型
             output_path_str = str(output_path)
-            print(f"保存图片到: {output_path_str}")
+            logger.debug("保存图片到: %s", output_path_str)
             
             # 确保输出目录存在
             output_dir = os.path.dirname(output_path_str)
@@ -80,7 +86,7 @@ class FileHandler:
                     output_path_str = f"{base_name}.png"
                 elif format.upper() in ['JPEG', 'JPG']:
                     output_path_str = f"{base_name}.jpg"
-                print(f"根据格式更新文件路径: {output_path_str}")
+                logger.debug("根据格式更新文件路径: %s", output_path_str)
             
             # 直接保存 - 测试显示这种方式在Windows上可以处理中文路径
             if format:
@@ -93,11 +99,10 @@ class FileHandler:
                 else:
                     image.save(output_path_str)
             
-            print(f"保存成功")
+            logger.debug("保存成功: %s", output_path_str)
             return True
         except Exception as e:
-            print(f"保存图片失败: {e}")
-            print(f"异常类型: {type(e).__name__}")
+            logger.warning("保存图片失败 %s: %s: %s", output_path_str, type(e).__name__, e)
             # 尝试降级方案：使用临时文件名然后重命名
             try:
                 # 降级方案中也需要更新临时文件的扩展名
@@ -112,7 +117,7 @@ class FileHandler:
                 else:
                     temp_path = os.path.join(os.path.dirname(output_path_str), temp_base + ".tmp")
                 
-                print(f"尝试临时文件方案: {temp_path}")
+                logger.info("尝试临时文件方案: %s", temp_path)
                 
                 if format:
                     image.save(temp_path, format=format, quality=quality)
@@ -122,13 +127,13 @@ class FileHandler:
                 # 使用os.rename重命名（Windows API可能更好地处理Unicode）
                 if os.path.exists(temp_path):
                     os.rename(temp_path, output_path_str)
-                    print(f"临时文件方案成功，已重命名到: {output_path_str}")
+                    logger.info("临时文件方案成功，已重命名到: %s", output_path_str)
                     return True
                 else:
-                    print("临时文件不存在")
+                    logger.warning("临时文件不存在: %s", temp_path)
                     return False
             except Exception as e2:
-                print(f"临时文件方案也失败: {e2}")
+                logger.error("临时文件方案也失败: %s", e2)
                 return False
     
     @staticmethod
@@ -176,11 +181,11 @@ class FileHandler:
             
             # 确保路径分隔符正确
             output_path = os.path.join(output_dir_str, new_name)
-            print(f"生成输出文件名: {output_path}")
+            logger.debug("生成输出文件名: %s", output_path)
             
             return output_path
         except Exception as e:
-            print(f"生成输出文件名时出错: {e}")
+            logger.warning("生成输出文件名时出错: %s", e)
             # 如果出错，使用安全的回退方案
             safe_name = "output_image" + str(hash(original_path))[:8] + ".png"
             return os.path.join(str(output_dir), safe_name)
\ No newline at end of file
@@ -0,0 +1,74 @@
+# src/core/folder_scanner.py
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, List, Tuple
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# 并行扫描子目录的线程数；网络共享目录的延迟主要在IO上，线程数可以多于CPU核心数
+DEFAULT_SCAN_WORKERS = 8
+
+
+def _scan_dir(path: str, extensions: frozenset) -> Tuple[List[str], List[str]]:
+    """
+    扫描单个目录（不递归）
+
+    DirEntry的类型信息来自目录读取结果，判断文件/目录时不需要额外的stat调用。
+
+    Returns:
+        Tuple[List[str], List[str]]: (匹配扩展名的文件, 子目录)
+    """
+    files, subdirs = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    # 与os.walk默认行为一致，不进入符号链接指向的目录，避免循环
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in extensions and entry.is_file():
+                        files.append(entry.path)
+                except OSError:
+                    continue
+    except OSError as e:
+        logger.warning("无法读取目录 %s: %s", path, e)
+    return files, subdirs
+
+
+def scan_images(folder_path: str, extensions: Iterable[str],
+                max_workers: int = DEFAULT_SCAN_WORKERS) -> Iterator[str]:
+    """
+    递归查找文件夹中指定扩展名的文件，边扫描边产出
+
+    各子目录在线程池中并行读取，调用方无需等待整个目录树扫描完成即可开始处理。
+    同一目录内的文件按名称排序，不同目录之间的顺序不固定。
+
+    Args:
+        folder_path: 文件夹路径
+        extensions: 扩展名列表（小写，带点，如'.jpg'）
+        max_workers: 并行扫描的线程数
+
+    Yields:
+        str: 文件路径
+    """
+    if not os.path.isdir(folder_path):
+        return
+    extensions = frozenset(ext.lower() for ext in extensions)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        pending = {executor.submit(_scan_dir, folder_path, extensions)}
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, subdirs = future.result()
+                    for subdir in subdirs:
+                        pending.add(executor.submit(_scan_dir, subdir, extensions))
+                    yield from sorted(files)
+        finally:
+            # 调用方提前停止迭代时，撤销尚未开始的目录
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,326 @@
+# src/core/font_registry.py
+import json
+import os
+import sys
+import tempfile
+import threading
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional
+
+from PIL import ImageFont
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# 支持的字体文件扩展名
+FONT_EXTENSIONS = ('.ttf', '.ttc', '.otf', '.otc')
+# 字体集合文件最多读取的字体数量
+MAX_COLLECTION_FACES = 16
+# 扫描缓存格式版本，结构变化时递增以丢弃旧缓存
+CACHE_VERSION = 2
+
+# 常规字重的样式名，同一样式有多个字体文件时优先选用
+REGULAR_STYLE_NAMES = ('regular', 'normal', 'roman', 'book', 'italic', 'oblique',
+                       'bold', 'bold italic', 'bold oblique')
+# 常用中文字体名称与字体文件内部英文族名的对应关系
+FAMILY_ALIASES = {
+    '微软雅黑': 'microsoft yahei',
+    '黑体': 'simhei',
+    '宋体': 'simsun',
+    '楷体': 'kaiti',
+    '仿宋': 'fangsong',
+}
+# 请求的字体不存在时依次尝试的后备字体族
+FALLBACK_FAMILIES = [
+    'Microsoft YaHei', 'SimHei', 'Arial Unicode MS', 'Arial',
+    'PingFang SC', 'Noto Sans CJK SC', 'Source Han Sans SC', 'WenQuanYi Micro Hei',
+    'Noto Sans', 'DejaVu Sans', 'Liberation Sans',
+]
+
+
+class FontMatch(NamedTuple):
+    """
+    字体解析结果
+
+    bold/italic表示字体文件本身是否已带有对应样式，
+    没有时由渲染器自行模拟。
+    """
+    path: str
+    index: int
+    bold: bool
+    italic: bool
+
+
+def _style_flags(style: str):
+    """根据字体样式名判断是否为粗体、斜体"""
+    style = style.lower()
+    bold = any(word in style for word in ('bold', 'black', 'heavy'))
+    italic = 'italic' in style or 'oblique' in style
+    return bold, italic
+
+
+def _fontconfig_dirs() -> List[str]:
+    """读取fontconfig配置中声明的字体目录"""
+    dirs = []
+    xdg_data_home = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+    for conf in ('/etc/fonts/fonts.conf', '/etc/fonts/local.conf'):
+        try:
+            root = ET.parse(conf).getroot()
+        except (OSError, ET.ParseError):
+            continue
+        for node in root.iter('dir'):
+            if not node.text:
+                continue
+            path = node.text.strip()
+            if node.get('prefix') == 'xdg':
+                path = os.path.join(xdg_data_home, path)
+            dirs.append(os.path.expanduser(path))
+    return dirs
+
+
+def system_font_dirs() -> List[str]:
+    """
+    获取当前平台的系统字体目录
+
+    Returns:
+        List[str]: 存在的字体目录列表（已去重）
+    """
+    if sys.platform.startswith('win'):
+        windir = os.environ.get('WINDIR', 'C:/Windows')
+        candidates = [os.path.join(windir, 'Fonts')]
+        local_app_data = os.environ.get('LOCALAPPDATA')
+        if local_app_data:
+            candidates.append(os.path.join(local_app_data, 'Microsoft', 'Windows', 'Fonts'))
+    elif sys.platform == 'darwin':
+        candidates = ['/System/Library/Fonts', '/Library/Fonts', os.path.expanduser('~/Library/Fonts')]
+    else:
+        candidates = _fontconfig_dirs() + [
+            '/usr/share/fonts', '/usr/local/share/fonts',
+            os.path.expanduser('~/.fonts'), os.path.expanduser('~/.local/share/fonts'),
+        ]
+
+    dirs = []
+    for path in candidates:
+        path = os.path.normpath(path)
+        if os.path.isdir(path) and path not in dirs:
+            dirs.append(path)
+    return dirs
+
+
+@lru_cache(maxsize=128)
+def get_font(path: str, size: int, index: int = 0) -> ImageFont.FreeTypeFont:
+    """
+    加载字体对象，相同 (路径, 字号, 索引) 只打开一次字体文件
+
+    Args:
+        path: 字体文件路径
+        size: 字号
+        index: 字体集合(.ttc)中的字体索引
+
+    Returns:
+        ImageFont.FreeTypeFont: 字体对象（共享，不要修改）
+    """
+    return ImageFont.truetype(path, size, index=index)
+
+
+@lru_cache(maxsize=32)
+def get_default_font(size: int):
+    """
+    加载PIL自带的默认字体，按字号缓存
+
+    Args:
+        size: 字号
+
+    Returns:
+        ImageFont: 默认字体对象
+    """
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        # 旧版本PIL的load_default不支持字号参数
+        return ImageFont.load_default()
+
+
+class FontRegistry:
+    """
+    系统字体注册表
+
+    首次使用时扫描一次系统字体目录，把 字体族/粗体/斜体 映射到字体文件，
+    扫描结果缓存在磁盘上，字体目录没有变化时直接复用。
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, font_dirs: Optional[List[str]] = None, cache_file: Optional[str] = None):
+        """
+        Args:
+            font_dirs: 要扫描的字体目录，默认为系统字体目录
+            cache_file: 扫描结果缓存文件路径，默认位于程序配置目录下
+        """
+        self.font_dirs = font_dirs if font_dirs is not None else system_font_dirs()
+        if cache_file is None:
+            config_dir = os.path.join(os.path.expanduser("~"), ".photo_watermark_tool")
+            cache_file = os.path.join(config_dir, "font_cache.json")
+        self.cache_file = cache_file
+        # 字体族(小写) -> {'粗体斜体标记(如"10")': [路径, 索引, 是否常规字重]}
+        self._families = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default(cls) -> 'FontRegistry':
+        """获取进程内共享的字体注册表"""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def _dir_signature(self) -> Dict[str, float]:
+        """记录所有字体目录及其子目录的修改时间，用于判断缓存是否失效"""
+        signature = {}
+        for font_dir in self.font_dirs:
+            for root, _, _ in os.walk(font_dir):
+                try:
+                    signature[root] = os.stat(root).st_mtime
+                except OSError:
+                    continue
+        return signature
+
+    def _load_cache(self, signature: Dict[str, float]):
+        """读取磁盘缓存，目录有变化或格式不符时返回None"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != CACHE_VERSION or data.get('dirs') != signature:
+            return None
+        return data.get('families')
+
+    def _save_cache(self, signature: Dict[str, float], families) -> None:
+        """保存扫描结果，失败不影响使用"""
+        try:
+            cache_dir = os.path.dirname(self.cache_file)
+            os.makedirs(cache_dir, exist_ok=True)
+            # 先写临时文件再原子替换，多个进程同时保存或写入中断都不会留下残缺的缓存
+            fd, tmp_path = tempfile.mkstemp(prefix='.font_cache_', suffix='.tmp', dir=cache_dir)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({'version': CACHE_VERSION, 'dirs': signature, 'families': families},
+                              f, ensure_ascii=False)
+                os.replace(tmp_path, self.cache_file)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            logger.warning("保存字体缓存失败: %s", e)
+
+    def _scan(self):
+        """扫描字体目录，读取每个字体文件的族名与样式"""
+        families = {}
+        for font_dir in self.font_dirs:
+            for root, _, files in os.walk(font_dir):
+                for name in files:
+                    if not name.lower().endswith(FONT_EXTENSIONS):
+                        continue
+                    path = os.path.join(root, name)
+                    is_collection = name.lower().endswith(('.ttc', '.otc'))
+                    for index in range(MAX_COLLECTION_FACES if is_collection else 1):
+                        try:
+                            family, style = ImageFont.truetype(path, 12, index=index).getname()
+                        except OSError:
+                            break
+                        if not family:
+                            continue
+                        bold, italic = _style_flags(style or '')
+                        styles = families.setdefault(family.lower(), {})
+                        key = f"{int(bold)}{int(italic)}"
+                        # 同一样式有多个字重时，优先常规字重（如Regular而非Light）
+                        regular = (style or '').lower() in REGULAR_STYLE_NAMES
+                        if key not in styles or (regular and not styles[key][2]):
+                            styles[key] = [path, index, regular]
+        return families
+
+    def _ensure_loaded(self):
+        """确保字体表已加载（磁盘缓存或重新扫描）"""
+        if self._families is not None:
+            return self._families
+        with self._lock:
+            if self._families is None:
+                signature = self._dir_signature()
+                families = self._load_cache(signature)
+                if families is None:
+                    families = self._scan()
+                    self._save_cache(signature, families)
+                self._families = families
+        return self._families
+
+    def families(self) -> List[str]:
+        """
+        获取所有已注册的字体族名
+
+        Returns:
+            List[str]: 小写的字体族名列表
+        """
+        return sorted(self._ensure_loaded())
+
+    def resolve(self, family: str, bold: bool = False, italic: bool = False) -> Optional[FontMatch]:
+        """
+        将字体族与样式解析为字体文件
+
+        优先选择样式完全匹配的字体，否则退回常规字体并由调用方模拟样式；
+        请求的字体不存在时依次尝试后备字体族。
+
+        Args:
+            family: 字体族名（支持常用中文名）
+            bold: 是否粗体
+            italic: 是否斜体
+
+        Returns:
+            Optional[FontMatch]: 解析结果，系统中没有可用字体时返回None
+        """
+        families = self._ensure_loaded()
+        for name in [family] + FALLBACK_FAMILIES:
+            if not name:
+                continue
+            key = FAMILY_ALIASES.get(name, name).lower()
+            styles = families.get(key)
+            if not styles:
+                continue
+            for want_bold, want_italic in ((bold, italic), (bold, False), (False, italic), (False, False)):
+                entry = styles.get(f"{int(want_bold)}{int(want_italic)}")
+                if entry:
+                    return FontMatch(entry[0], entry[1], want_bold, want_italic)
+            # 只有其他样式的字体时，直接使用第一个，并如实返回它自带的样式
+            style_key, entry = next(iter(styles.items()))
+            return FontMatch(entry[0], entry[1], style_key[0] == '1', style_key[1] == '1')
+        return None
+
+    def load(self, family: str, size: int, bold: bool = False, italic: bool = False):
+        """
+        加载字体对象
+
+        Args:
+            family: 字体族名
+            size: 字号
+            bold: 是否粗体
+            italic: 是否斜体
+
+        Returns:
+            tuple: (字体对象, 字体是否自带粗体, 字体是否自带斜体)
+        """
+        match = self.resolve(family, bold, italic)
+        if match is not None:
+            try:
+                return get_font(match.path, size, match.index), match.bold, match.italic
+            except OSError as e:
+                logger.warning("加载字体文件失败 %s: %s", match.path, e)
+
+        logger.debug("使用默认字体")
+        return get_default_font(size), False, False
@@ -0,0 +1,151 @@
+# src/core/image_cache.py
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+from PIL import Image
+
+from .image_processor import ImageProcessor
+
+
+def file_key(file_path: str) -> Optional[Tuple[str, int, int]]:
+    """
+    生成文件的缓存键：(规范化路径, 修改时间, 文件大小)
+
+    文件被修改或替换后键随之变化，旧的缓存项自然失效。
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        Optional[Tuple[str, int, int]]: 缓存键，文件不存在时返回None
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return (os.path.normcase(os.path.abspath(file_path)), stat.st_mtime_ns, stat.st_size)
+
+
+def image_nbytes(image: Image.Image) -> int:
+    """估算解码后图像占用的字节数"""
+    return image.width * image.height * len(image.getbands())
+
+
+class ImageCache:
+    """
+    已解码图像的LRU缓存，按字节数限制总大小
+
+    同一文件的不同版本（如预览代理图、缩略图）分别缓存，
+    反复预览同一张图片时不再读取磁盘或重新解码。缓存的图像只读，不能被修改。
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: 缓存图像的总字节数上限
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_bytes(self) -> int:
+        """当前缓存占用的字节数"""
+        return self._total_bytes
+
+    def get(self, key: Hashable):
+        """查找缓存项，命中时将其移到最近使用的位置"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, value, size: int) -> None:
+        """
+        加入缓存项，超出字节上限时淘汰最久未使用的项
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+            size: 缓存值占用的字节数
+        """
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+    def get_or_load(self, file_path: str, variant: Hashable, loader: Callable[[str], Optional[Image.Image]]):
+        """
+        获取文件指定版本的解码结果，未缓存时调用loader加载
+
+        Args:
+            file_path: 文件路径
+            variant: 版本标识，如 ('proxy', (540, 440))
+            loader: 加载函数，参数为文件路径，返回图像或(图像, 附加信息)元组，失败返回None
+
+        Returns:
+            loader的返回值，加载失败返回None
+        """
+        key = file_key(file_path)
+        if key is None:
+            return None
+        key = key + (variant,)
+        value = self.get(key)
+        if value is not None:
+            return value
+        value = loader(file_path)
+        if value is not None:
+            image = value[0] if isinstance(value, tuple) else value
+            self.put(key, value, image_nbytes(image))
+        return value
+
+    def load_proxy(self, file_path: str, size: Tuple[int, int]):
+        """
+        获取预览代理图像（见ImageProcessor.load_proxy），优先从缓存读取
+
+        Args:
+            file_path: 图片文件路径
+            size: 代理图像的最大尺寸 (width, height)
+
+        Returns:
+            Optional[Tuple[Image.Image, Tuple[int, int]]]: (只读的RGB代理图像, 原图尺寸)，加载失败返回None
+        """
+        return self.get_or_load(file_path, ('proxy', tuple(size)),
+                                lambda path: ImageProcessor.load_proxy(path, size))
+
+    def load_logo(self, file_path: str):
+        """
+        获取解码后的图片水印（见ImageProcessor.load_logo），同一文件只解码一次
+
+        Args:
+            file_path: 图片路径
+
+        Returns:
+            Optional[Image.Image]: 只读的RGBA图像，加载失败返回None
+        """
+        return self.get_or_load(file_path, 'logo', ImageProcessor.load_logo)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# 进程内共享的图像缓存，预览面板与图片列表共用
+IMAGE_CACHE = ImageCache()
@@ -0,0 +1,142 @@
+# src/core/image_probe.py
+import struct
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from PIL import Image, UnidentifiedImageError
+
+from .image_cache import file_key
+
+
+# 识别格式所需的文件头字节数
+HEADER_SIZE = 32
+# 查找JPEG帧头(SOF)时最多跳过的段数，防止损坏文件导致长时间扫描
+MAX_JPEG_SEGMENTS = 64
+# JPEG中带有尺寸信息的SOF标记（排除DHT=C4、JPG=C8、DAC=CC）
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+JPEG_MODES = {1: 'L', 3: 'RGB', 4: 'CMYK'}
+PNG_MODES = {0: 'L', 2: 'RGB', 3: 'P', 4: 'LA', 6: 'RGBA'}
+
+
+class ImageInfo(NamedTuple):
+    """
+    图片文件头探测结果
+
+    error为None表示文件可以处理，否则为拒绝原因。
+    """
+    format: Optional[str]
+    width: int
+    height: int
+    mode: Optional[str]
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """文件是否可以处理"""
+        return self.error is None
+
+    @property
+    def decoded_bytes(self) -> int:
+        """完整解码后大约占用的内存字节数（按RGBA估算）"""
+        return self.width * self.height * 4
+
+
+def _rejected(reason: str, format: Optional[str] = None) -> ImageInfo:
+    return ImageInfo(format, 0, 0, None, reason)
+
+
+def _probe_jpeg(f) -> ImageInfo:
+    """逐段跳过JPEG标记，读取第一个SOF段中的尺寸与通道数"""
+    f.seek(2)
+    for _ in range(MAX_JPEG_SEGMENTS):
+        byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if not byte:
+            break
+        marker = byte[0]
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+            # 独立标记，没有段长度
+            continue
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            break
+        length = struct.unpack('>H', length_bytes)[0]
+        if marker in JPEG_SOF_MARKERS:
+            data = f.read(6)
+            if len(data) < 6:
+                break
+            _, height, width, components = struct.unpack('>BHHB', data)
+            return ImageInfo('JPEG', width, height, JPEG_MODES.get(components, 'RGB'))
+        if marker == 0xDA or length < 2:
+            # 到达图像数据仍未找到帧头
+            break
+        f.seek(length - 2, 1)
+    return _rejected("JPEG文件头损坏：未找到图像尺寸", 'JPEG')
+
+
+def _probe_header(file_path: str) -> ImageInfo:
+    """读取文件头识别格式、尺寸和颜色模式，不解码像素数据"""
+    try:
+        with open(file_path, 'rb', buffering=4096) as f:
+            header = f.read(HEADER_SIZE)
+            if header.startswith(b'\xff\xd8\xff'):
+                return _probe_jpeg(f)
+            if header.startswith(b'\x89PNG\r\n\x1a\n'):
+                if len(header) < 26 or header[12:16] != b'IHDR':
+                    return _rejected("PNG文件头损坏", 'PNG')
+                width, height, _, color_type = struct.unpack('>IIBB', header[16:26])
+                return ImageInfo('PNG', width, height, PNG_MODES.get(color_type, 'RGB'))
+            if header[:6] in (b'GIF87a', b'GIF89a'):
+                width, height = struct.unpack('<HH', header[6:10])
+                return ImageInfo('GIF', width, height, 'P')
+            if header.startswith(b'BM') and len(header) >= 30:
+                dib_size = struct.unpack('<I', header[14:18])[0]
+                if dib_size == 12:
+                    width, height, _, bpp = struct.unpack('<HHHH', header[18:26])
+                else:
+                    width, height, _, bpp = struct.unpack('<iiHH', header[18:30])
+                return ImageInfo('BMP', abs(width), abs(height), 'P' if bpp <= 8 else 'RGB')
+        # TIFF的尺寸位于IFD中，WebP等其他格式也交给PIL解析文件头（同样不解码像素）
+        try:
+            with Image.open(file_path) as img:
+                return ImageInfo(img.format, img.width, img.height, img.mode)
+        except UnidentifiedImageError:
+            return _rejected("不支持的图片格式或文件内容与扩展名不符")
+    except OSError as e:
+        return _rejected(f"无法读取文件: {e}")
+    except (struct.error, ValueError, Image.DecompressionBombError) as e:
+        return _rejected(f"文件头损坏: {e}")
+
+
+@lru_cache(maxsize=8192)
+def _probe_cached(key) -> ImageInfo:
+    """按 (路径, 修改时间, 文件大小) 缓存探测结果，文件变化后自动重新探测"""
+    info = _probe_header(key[0])
+    if info.ok:
+        if info.width <= 0 or info.height <= 0:
+            return info._replace(error="图片尺寸无效")
+        # 超过PIL解压炸弹上限两倍的图片在加载时会被PIL拒绝
+        max_pixels = Image.MAX_IMAGE_PIXELS
+        if max_pixels and info.width * info.height > 2 * max_pixels:
+            return info._replace(error=f"图片尺寸过大: {info.width}x{info.height}")
+    return info
+
+
+def probe_image(file_path: str) -> ImageInfo:
+    """
+    快速探测图片文件的格式、尺寸和颜色模式
+
+    只读取文件头（JPEG读到帧头为止），根据内容而不是扩展名判断格式；
+    无法直接识别的文件头交给PIL解析，PIL也无法识别时才拒绝。结果按文件缓存。
+
+    Args:
+        file_path: 图片路径
+
+    Returns:
+        ImageInfo: 探测结果，info.ok为False时error说明拒绝原因
+    """
+    key = file_key(file_path)
+    if key is None:
+        return _rejected("文件不存在")
+    return _probe_cached(key)
@@ -1,8 +1,65 @@
 # src/core/image_processor.py
 import os
+import struct
+from io import BytesIO
 from PIL import Image
 from typing import Optional, Tuple
 
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# EXIF中IFD1记录内嵌JPEG缩略图位置与长度的标签
+EXIF_THUMBNAIL_OFFSET_TAG = 0x0201
+EXIF_THUMBNAIL_LENGTH_TAG = 0x0202
+# 内嵌缩略图与原图宽高比允许的相对误差，超出说明缩略图带有黑边
+EXIF_THUMBNAIL_ASPECT_TOLERANCE = 0.03
+
+
+def _read_exif_thumbnail(exif: bytes) -> Optional[bytes]:
+    """
+    从EXIF数据(APP1)中取出IFD1内嵌的JPEG缩略图
+
+    Args:
+        exif: EXIF原始数据，可以带有'Exif\\0\\0'前缀
+
+    Returns:
+        Optional[bytes]: 缩略图JPEG数据，不存在或数据损坏时返回None
+    """
+    if exif.startswith(b'Exif\x00\x00'):
+        exif = exif[6:]
+    if len(exif) < 8 or exif[:2] not in (b'II', b'MM'):
+        return None
+    order = '<' if exif[:2] == b'II' else '>'
+    try:
+        # 跳过IFD0，找到IFD1
+        ifd0_offset = struct.unpack_from(order + 'I', exif, 4)[0]
+        count = struct.unpack_from(order + 'H', exif, ifd0_offset)[0]
+        ifd1_offset = struct.unpack_from(order + 'I', exif, ifd0_offset + 2 + count * 12)[0]
+        if not ifd1_offset:
+            return None
+
+        offset = length = None
+        count = struct.unpack_from(order + 'H', exif, ifd1_offset)[0]
+        for i in range(count):
+            tag, field_type, _, value = struct.unpack_from(order + 'HHII', exif, ifd1_offset + 2 + i * 12)
+            if field_type == 3:
+                # SHORT类型的值位于4字节字段的前两个字节
+                value = struct.unpack_from(order + 'H', exif, ifd1_offset + 2 + i * 12 + 8)[0]
+            if tag == EXIF_THUMBNAIL_OFFSET_TAG:
+                offset = value
+            elif tag == EXIF_THUMBNAIL_LENGTH_TAG:
+                length = value
+    except struct.error:
+        return None
+
+    if not offset or not length or offset + length > len(exif):
+        return None
+    data = exif[offset:offset + length]
+    return data if data.startswith(b'\xff\xd8') else None
+
+
 class ImageProcessor:
     """
     图像处理器类，负责图像处理相关功能
@@ -24,15 +81,100 @@ class ImageProcessor:
         try:
             # 确保路径为字符串类型
             file_path_str = str(file_path)
-            print(f"尝试加载图片: {file_path_str}")
+            logger.debug("尝试加载图片: %s", file_path_str)
             
             # 直接加载 - 简化实现
             img = Image.open(file_path_str)
             return img
         except Exception as e:
-            print(f"加载图片失败: {e}")
+            logger.warning("加载图片失败 %s: %s", file_path, e)
+            return None
+    
+    @staticmethod
+    def load_logo(file_path: str) -> Optional[Image.Image]:
+        """
+        加载图片水印（如Logo），保留透明通道
+        
+        Args:
+            file_path: 图片路径
+            
+        Returns:
+            Optional[Image.Image]: 完整解码的RGBA图像，失败返回None
+        """
+        try:
+            with Image.open(str(file_path)) as img:
+                return img.convert('RGBA')
+        except Exception as e:
+            logger.warning("加载水印图片失败 %s: %s", file_path, e)
             return None
     
+    @staticmethod
+    def load_proxy(file_path: str, size: Tuple[int, int]) -> Optional[Tuple[Image.Image, Tuple[int, int]]]:
+        """
+        直接解码为不超过指定尺寸的代理图像，用于预览
+
+        JPEG使用draft在解码阶段按1/2、1/4、1/8缩小，其他格式解码后再缩小。
+
+        Args:
+            file_path: 图片文件路径
+            size: 代理图像的最大尺寸 (width, height)
+
+        Returns:
+            Optional[Tuple[Image.Image, Tuple[int, int]]]: (RGB代理图像, 原图尺寸)，加载失败返回None
+        """
+        try:
+            with Image.open(str(file_path)) as img:
+                original_size = img.size
+                # 只对JPEG生效，其他格式直接忽略
+                img.draft('RGB', size)
+                if img.mode not in ('RGB', 'RGBA', 'L'):
+                    img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+                # reducing_gap先用整数倍快速缩小，再做高质量重采样（原地修改并完成解码）
+                img.thumbnail(size, Image.LANCZOS, reducing_gap=2.0)
+                # 不超过代理尺寸的RGB图片不会被thumbnail解码，关闭文件前必须完成解码
+                img.load()
+                proxy = img.convert('RGB') if img.mode != 'RGB' else img
+                return proxy, original_size
+        except Exception as e:
+            logger.warning("加载预览图片失败 %s: %s", file_path, e)
+            return None
+
+    @staticmethod
+    def load_thumbnail(file_path: str, size: Tuple[int, int]) -> Optional[Image.Image]:
+        """
+        快速生成缩略图
+
+        JPEG优先使用EXIF中内嵌的缩略图（不解码原图），内嵌缩略图不存在、
+        尺寸不够或宽高比与原图不一致时，退回load_proxy的缩小解码。
+
+        Args:
+            file_path: 图片文件路径
+            size: 缩略图最大尺寸 (width, height)
+
+        Returns:
+            Optional[Image.Image]: RGB缩略图，加载失败返回None
+        """
+        try:
+            with Image.open(str(file_path)) as img:
+                original_size = img.size
+                exif = img.info.get('exif') if img.format == 'JPEG' else None
+            data = _read_exif_thumbnail(exif) if exif else None
+            if data is not None:
+                with Image.open(BytesIO(data)) as embedded:
+                    embedded.load()
+                    width, height = embedded.size
+                    aspect = (width / height) / (original_size[0] / original_size[1])
+                    if (width >= size[0] or height >= size[1]) and \
+                            abs(aspect - 1) <= EXIF_THUMBNAIL_ASPECT_TOLERANCE:
+                        thumbnail = embedded.convert('RGB') if embedded.mode != 'RGB' else embedded.copy()
+                        thumbnail.thumbnail(size, Image.LANCZOS)
+                        return thumbnail
+        except Exception as e:
+            logger.debug("读取内嵌缩略图失败 %s: %s", file_path, e)
+
+        loaded = ImageProcessor.load_proxy(file_path, size)
+        return loaded[0] if loaded is not None else None
+
     @staticmethod
     def create_thumbnail(image: Image.Image, size: Tuple[int, int]) -> Image.Image:
         """
@@ -106,31 +248,71 @@ class ImageProcessor:
         Returns:
             Image.Image: 调整大小后的图像
         """
-        if resize_type == "original":
+        size = ImageProcessor.get_output_size(image.size, resize_type, width, height, percent)
+        if size == image.size:
             return image.copy()
+        return image.resize(size, Image.LANCZOS)
+    
+    @staticmethod
+    def get_output_size(size: Tuple[int, int], resize_type: str = "original",
+                        width: int = None, height: int = None,
+                        percent: float = None) -> Tuple[int, int]:
+        """
+        根据设置计算输出尺寸（不需要解码图片）
         
-        original_width, original_height = image.size
+        Args:
+            size: 原始尺寸 (width, height)
+            resize_type: 调整方式 (original, width, height, percent)
+            width: 目标宽度
+            height: 目标高度
+            percent: 缩放百分比
+            
+        Returns:
+            Tuple[int, int]: 输出尺寸 (width, height)
+        """
+        original_width, original_height = size
         
         if resize_type == "width" and width:
             # 按宽度调整，保持长宽比
             ratio = width / original_width
-            new_height = int(original_height * ratio)
-            return image.resize((width, new_height), Image.LANCZOS)
+            return int(width), int(original_height * ratio)
         
         elif resize_type == "height" and height:
             # 按高度调整，保持长宽比
             ratio = height / original_height
-            new_width = int(original_width * ratio)
-            return image.resize((new_width, height), Image.LANCZOS)
+            return int(original_width * ratio), int(height)
         
         elif resize_type == "percent" and percent:
             # 按百分比调整
             ratio = percent / 100
-            new_width = int(original_width * ratio)
-            new_height = int(original_height * ratio)
-            return image.resize((new_width, new_height), Image.LANCZOS)
+            return int(original_width * ratio), int(original_height * ratio)
         
-        return image.copy()
+        return tuple(size)
+    
+    @staticmethod
+    def resize_for_output(image: Image.Image, size: Tuple[int, int], mode: str) -> Image.Image:
+        """
+        将刚打开（尚未解码）的图片缩放到输出尺寸，用于先缩放再添加水印
+        
+        JPEG缩小时使用draft在解码阶段按1/2、1/4、1/8缩小，再重采样到精确尺寸。
+        先转换为输出模式再重采样，调色板等模式也能得到平滑的缩放结果。
+        
+        Args:
+            image: 刚打开的图像
+            size: 输出尺寸 (width, height)
+            mode: 输出模式（RGB或RGBA）
+            
+        Returns:
+            Image.Image: 缩放后的图像（尺寸不变时返回原图像）
+        """
+        if size == image.size:
+            return image
+        if size[0] < image.width and size[1] < image.height:
+            # 只对JPEG生效，解码尺寸不会小于输出尺寸
+            image.draft('RGB', size)
+        if image.mode not in (mode, 'L'):
+            image = image.convert(mode)
+        return image.resize(size, Image.LANCZOS)
     
     @staticmethod
     def save_image(image: Image.Image, file_path: str, format: str = None, 
@@ -176,5 +358,5 @@ class ImageProcessor:
             
             return True
         except Exception as e:
-            print(f"保存图像失败: {e}")
+            logger.warning("保存图像失败: %s", e)
             return False
\ No newline at end of file
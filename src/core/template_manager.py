@@ -3,6 +3,10 @@ import json
 import os
 import datetime
 
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 class TemplateManager:
     """
     水印模板管理器，负责模板的保存、加载和删除
@@ -56,7 +60,7 @@ class TemplateManager:
             
             return True
         except Exception as e:
-            print(f"保存模板失败: {e}")
+            logger.warning("保存模板失败: %s", e)
             return False
     
     def load_template(self, template_name):
@@ -76,7 +80,7 @@ class TemplateManager:
             
             return template_data['settings']
         except Exception as e:
-            print(f"加载模板失败: {e}")
+            logger.warning("加载模板失败: %s", e)
             return None
     
     def delete_template(self, template_name):
@@ -96,7 +100,7 @@ class TemplateManager:
                 return True
             return False
         except Exception as e:
-            print(f"删除模板失败: {e}")
+            logger.warning("删除模板失败: %s", e)
             return False
     
     def get_all_templates(self):
@@ -116,7 +120,7 @@ class TemplateManager:
                         templates.append(template_name)
             return sorted(templates)
         except Exception as e:
-            print(f"获取模板列表失败: {e}")
+            logger.warning("获取模板列表失败: %s", e)
             return []
     
     def save_last_settings(self, settings):
@@ -130,7 +134,7 @@ class TemplateManager:
             with open(self.last_settings_file, 'w', encoding='utf-8') as f:
                 json.dump(settings, f, ensure_ascii=False, indent=2)
         except Exception as e:
-            print(f"保存最后设置失败: {e}")
+            logger.warning("保存最后设置失败: %s", e)
     
     def load_last_settings(self):
         """
@@ -145,7 +149,7 @@ class TemplateManager:
                     return json.load(f)
             return None
         except Exception as e:
-            print(f"加载最后设置失败: {e}")
+            logger.warning("加载最后设置失败: %s", e)
             return None
     
     def save_default_template(self, settings):
@@ -159,7 +163,7 @@ class TemplateManager:
             with open(self.default_template_file, 'w', encoding='utf-8') as f:
                 json.dump(settings, f, ensure_ascii=False, indent=2)
         except Exception as e:
-            print(f"保存默认模板失败: {e}")
+            logger.warning("保存默认模板失败: %s", e)
     
     def load_default_template(self):
         """
@@ -174,5 +178,5 @@ class TemplateManager:
                     return json.load(f)
             return None
         except Exception as e:
-            print(f"加载默认模板失败: {e}")
+            logger.warning("加载默认模板失败: %s", e)
             return None
\ No newline at end of file
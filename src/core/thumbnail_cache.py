@@ -0,0 +1,179 @@
+# src/core/thumbnail_cache.py
+import hashlib
+import os
+import threading
+from typing import Optional, Tuple
+
+from PIL import Image
+
+from .image_cache import file_key
+from .image_processor import ImageProcessor
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# 缩略图文件的JPEG质量
+THUMBNAIL_QUALITY = 85
+# 超出上限后清理到上限的这一比例，避免每次写入都触发清理
+EVICT_TARGET_RATIO = 0.9
+
+
+class ThumbnailCache:
+    """
+    磁盘缩略图缓存
+
+    缩略图以小JPEG文件保存在程序配置目录下，按 (路径, 修改时间, 文件大小, 尺寸) 命名，
+    原图修改后自动生成新的缩略图。总大小超过上限时按最近使用时间淘汰。
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 200 * 1024 * 1024):
+        """
+        Args:
+            cache_dir: 缩略图目录，默认位于程序配置目录下
+            max_bytes: 缩略图文件总大小上限
+        """
+        if cache_dir is None:
+            config_dir = os.path.join(os.path.expanduser("~"), ".photo_watermark_tool")
+            cache_dir = os.path.join(config_dir, "thumbnails")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # 首次使用时统计一次目录大小，之后增量维护
+        self._total_bytes = None
+        self._lock = threading.Lock()
+
+    def _cache_path(self, key, size: Tuple[int, int]) -> str:
+        """根据原图缓存键和尺寸生成缩略图文件路径"""
+        digest = hashlib.sha1(repr((key, tuple(size))).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest + '.jpg')
+
+    def _entries(self):
+        """列出缓存目录中的缩略图文件 (路径, 大小, 最近使用时间)"""
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith('.jpg'):
+                        stat = entry.stat()
+                        entries.append((entry.path, stat.st_size, stat.st_mtime))
+        except OSError:
+            pass
+        return entries
+
+    def _ensure_total(self) -> int:
+        """获取缓存目录的总大小（调用方需持有锁）"""
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._entries())
+        return self._total_bytes
+
+    def _evict(self) -> None:
+        """按最近使用时间删除最旧的缩略图，直到总大小低于上限（调用方需持有锁）"""
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * EVICT_TARGET_RATIO
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+        self._total_bytes = total
+
+    def get(self, file_path: str, size: Tuple[int, int]) -> Optional[Image.Image]:
+        """
+        读取缓存的缩略图
+
+        Args:
+            file_path: 原图路径
+            size: 缩略图最大尺寸
+
+        Returns:
+            Optional[Image.Image]: 缩略图，未缓存时返回None
+        """
+        key = file_key(file_path)
+        if key is None:
+            return None
+        cache_path = self._cache_path(key, size)
+        try:
+            with Image.open(cache_path) as img:
+                img.load()
+                thumbnail = img.convert('RGB') if img.mode != 'RGB' else img.copy()
+            # 更新修改时间作为最近使用时间，供淘汰时排序
+            os.utime(cache_path, None)
+            return thumbnail
+        except (OSError, ValueError):
+            return None
+
+    def put(self, file_path: str, size: Tuple[int, int], thumbnail: Image.Image) -> None:
+        """
+        保存缩略图，失败不影响使用
+
+        Args:
+            file_path: 原图路径
+            size: 缩略图最大尺寸
+            thumbnail: 缩略图
+        """
+        key = file_key(file_path)
+        if key is None:
+            return
+        cache_path = self._cache_path(key, size)
+        temp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            image = thumbnail.convert('RGB') if thumbnail.mode != 'RGB' else thumbnail
+            image.save(temp_path, 'JPEG', quality=THUMBNAIL_QUALITY)
+            written = os.path.getsize(temp_path)
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            logger.warning("保存缩略图缓存失败: %s", e)
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                # 首次统计时已包含刚写入的文件
+                total = self._ensure_total()
+            else:
+                total = self._total_bytes + written
+            self._total_bytes = total
+            if total > self.max_bytes:
+                self._evict()
+
+    def load(self, file_path: str, size: Tuple[int, int]) -> Optional[Image.Image]:
+        """
+        获取缩略图：优先读取磁盘缓存，否则从原图生成（内嵌缩略图或缩小解码）并写入缓存
+
+        Args:
+            file_path: 原图路径
+            size: 缩略图最大尺寸
+
+        Returns:
+            Optional[Image.Image]: RGB缩略图，原图无法加载时返回None
+        """
+        thumbnail = self.get(file_path, size)
+        if thumbnail is not None:
+            return thumbnail
+        thumbnail = ImageProcessor.load_thumbnail(file_path, size)
+        if thumbnail is None:
+            return None
+        self.put(file_path, size, thumbnail)
+        return thumbnail
+
+    def clear(self) -> None:
+        """删除所有缓存的缩略图"""
+        with self._lock:
+            for path, _, _ in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+            self._total_bytes = 0
+
+
+# 进程内共享的缩略图缓存
+THUMBNAIL_CACHE = ThumbnailCache()
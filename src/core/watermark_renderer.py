@@ -0,0 +1,612 @@
+# src/core/watermark_renderer.py
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+from .alpha_blend import BLEND_BACKEND
+from .font_registry import FontRegistry
+from .image_cache import IMAGE_CACHE, file_key
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# 斜体倾斜系数
+ITALIC_SKEW = 0.2
+# 文本图层四周的留白，需容纳描边与阴影
+STAMP_PADDING = 20
+# 阴影偏移量（像素）
+SHADOW_OFFSET = 2
+# 阴影的高斯模糊半径（像素）
+SHADOW_BLUR = 1
+# 在整张图片上重复水印的样式
+TILE_STYLES = ('tile', 'diagonal')
+
+
+class RenderPlan(NamedTuple):
+    """
+    编译后的水印渲染计划（不可变），同一计划可应用到任意多张图片
+    """
+    text: str
+    font_id: Hashable
+    font: Any
+    font_size: int
+    fill: Tuple[int, int, int, int]
+    stroke_fill: Tuple[int, int, int, int]
+    stroke_width: int
+    shadow: bool
+    # 字体文件本身不带对应样式时，需要模拟的粗体/斜体
+    bold: bool
+    italic: bool
+    rotation: float
+    h_position: float
+    v_position: float
+    style: str
+    spacing: int
+    text_bbox: Tuple[int, int, int, int]
+    glyph_mask: Optional[Image.Image]
+    # 图片水印：完整解码的原图（只读）与其文件缓存键；文本水印时均为None。
+    # 图片水印的text_bbox为缩放后的尺寸
+    logo: Optional[Image.Image] = None
+    logo_key: Optional[Hashable] = None
+
+
+def parse_color(color_str: str, alpha: int, default: Tuple[int, int, int] = (255, 255, 255)) -> Tuple[int, int, int, int]:
+    """
+    将十六进制颜色字符串转换为RGBA元组
+
+    Args:
+        color_str: 颜色字符串，如'#FF8800'
+        alpha: 透明通道值 (0-255)
+        default: 解析失败时使用的RGB颜色
+
+    Returns:
+        Tuple[int, int, int, int]: RGBA颜色
+    """
+    try:
+        value = str(color_str).lstrip('#')
+        if len(value) != 6:
+            raise ValueError(f"颜色字符串长度不正确: {color_str}")
+        return (int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16), alpha)
+    except (TypeError, ValueError) as e:
+        logger.warning("颜色转换失败: %s", e)
+        return default + (alpha,)
+
+
+class StampCache:
+    """
+    已渲染水印图层的LRU缓存，按渲染参数索引
+
+    批量导出时每张图片的文字、字体、颜色、效果和旋转都相同，
+    只需栅格化一次，之后直接复用缓存的图层。缓存的图层只读，不能被修改。
+    """
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            max_entries: 最多缓存的图层数量
+            max_bytes: 缓存图层的总字节数上限
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(plan: RenderPlan) -> Hashable:
+        """
+        由渲染计划生成缓存键，只包含影响图层像素的参数（不含位置）
+
+        字号和描边宽度已按缩放比例换算为像素值，不同缩放档位自然对应不同的键。
+        """
+        if plan.logo is not None:
+            # 图片水印按文件、缩放后尺寸、透明度和旋转区分
+            return ('logo', plan.logo_key, plan.text_bbox, plan.fill[3], plan.rotation)
+        return (plan.text, plan.font_id, plan.font_size, plan.bold, plan.italic,
+                plan.fill, plan.stroke_fill, plan.stroke_width, plan.shadow, plan.rotation)
+
+    def get(self, key: Hashable) -> Optional[Image.Image]:
+        """查找缓存的图层，命中时将其移到最近使用的位置"""
+        with self._lock:
+            stamp = self._entries.get(key)
+            if stamp is not None:
+                self._entries.move_to_end(key)
+            return stamp
+
+    def put(self, key: Hashable, stamp: Image.Image) -> None:
+        """加入图层，超出数量或字节上限时淘汰最久未使用的图层"""
+        size = stamp.width * stamp.height * len(stamp.getbands())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old.width * old.height * len(old.getbands())
+            self._entries[key] = stamp
+            self._total_bytes += size
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted.width * evicted.height * len(evicted.getbands())
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# 进程内共享的水印图层缓存
+STAMP_CACHE = StampCache()
+
+
+class WatermarkRenderer:
+    """
+    水印渲染器，与Qt无关，供预览、导出和批处理共用
+
+    先将设置字典编译为RenderPlan（解析颜色、加载字体、栅格化字形），
+    之后对每张图片只做定位与合成。
+    """
+
+    def __init__(self, settings: Dict[str, Any], scale: float = 1.0,
+                 pitch: Optional[Tuple[float, float]] = None):
+        """
+        Args:
+            settings: 水印设置字典
+            scale: 字号、描边宽度等像素尺寸的缩放比例（用于缩小后的预览图或导出图）
+            pitch: 平铺图案的重复间距（像素，可为小数），为None时使用图案单元的尺寸
+        """
+        self.settings = dict(settings)
+        self.scale = scale
+        self.pitch = pitch
+        self.plan = self.compile(self.settings, scale)
+        self._stamp = None
+        # 平铺样式按图片宽度与相位缓存的整行图案 ((宽度, 相位), 图案行)
+        self._strip = None
+        # 最近一次按其他缩放比例编译的渲染器
+        self._rescaled = None
+
+    def rescaled(self, scale: float) -> 'WatermarkRenderer':
+        """
+        获取相同设置、按指定缩放比例编译的渲染器
+
+        批量导出按百分比缩放时所有图片比例相同，最近一次的结果会被复用。
+        平铺样式沿用本渲染器图案单元按比例换算的间距，缩放后各个水印的位置
+        不会因图案单元尺寸取整而逐个累积偏差。
+
+        Args:
+            scale: 像素尺寸缩放比例
+
+        Returns:
+            WatermarkRenderer: 渲染器（比例相同时返回自身）
+        """
+        if scale == self.scale:
+            return self
+        if self._rescaled is None or self._rescaled.scale != scale:
+            pitch = None
+            if self.plan.style in TILE_STYLES:
+                pattern = self.get_pattern(self.plan)
+                if pattern is not None:
+                    pitch_x, pitch_y = self.pitch or pattern.size
+                    ratio = scale / self.scale
+                    pitch = (pitch_x * ratio, pitch_y * ratio)
+            self._rescaled = WatermarkRenderer(self.settings, scale, pitch)
+        return self._rescaled
+
+    @property
+    def stamp(self) -> Optional[Image.Image]:
+        """按需绘制并复用本渲染器的水印图层"""
+        if self._stamp is None:
+            self._stamp = self.get_stamp(self.plan)
+        return self._stamp
+
+    @classmethod
+    def get_stamp(cls, plan: RenderPlan) -> Optional[Image.Image]:
+        """
+        获取渲染计划对应的水印图层，优先从共享缓存中读取
+
+        Args:
+            plan: 渲染计划
+
+        Returns:
+            Optional[Image.Image]: 只读的RGBA水印图层，没有水印内容时返回None
+        """
+        if plan.glyph_mask is None and plan.logo is None:
+            return None
+        key = StampCache.make_key(plan)
+        stamp = STAMP_CACHE.get(key)
+        if stamp is None:
+            stamp = cls.render_stamp(plan)
+            STAMP_CACHE.put(key, stamp)
+        return stamp
+
+    @classmethod
+    def get_pattern(cls, plan: RenderPlan) -> Optional[Image.Image]:
+        """
+        获取平铺样式的图案单元，优先从共享缓存中读取
+
+        Args:
+            plan: 渲染计划
+
+        Returns:
+            Optional[Image.Image]: 只读的RGBA图案单元，没有水印内容时返回None
+        """
+        stamp = cls.get_stamp(plan)
+        if stamp is None:
+            return None
+        key = (StampCache.make_key(plan), plan.style, plan.spacing)
+        pattern = STAMP_CACHE.get(key)
+        if pattern is None:
+            pattern = cls.render_pattern(plan, stamp)
+            STAMP_CACHE.put(key, pattern)
+        return pattern
+
+    @staticmethod
+    def validate(settings: Dict[str, Any]) -> None:
+        """
+        导出前检查水印设置：图片水印必须指定可以加载的图片文件
+
+        Args:
+            settings: 水印设置字典
+
+        Raises:
+            ValueError: 图片水印未指定图片文件
+            IOError: 水印图片无法加载
+        """
+        if settings.get('type', 'text') != 'image':
+            return
+        image_path = settings.get('image_path')
+        if not image_path:
+            raise ValueError("图片水印未选择图片文件")
+        if IMAGE_CACHE.load_logo(image_path) is None:
+            raise IOError(f"无法加载水印图片: {image_path}")
+
+    @staticmethod
+    def compile(settings: Dict[str, Any], scale: float = 1.0) -> RenderPlan:
+        """
+        将水印设置字典编译为不可变的渲染计划
+
+        Args:
+            settings: 水印设置字典
+            scale: 像素尺寸缩放比例
+
+        Returns:
+            RenderPlan: 渲染计划
+
+        Raises:
+            IOError: 指定的水印图片无法加载
+        """
+        # 图片水印不绘制文本
+        is_logo = settings.get('type', 'text') == 'image'
+        text = '' if is_logo else str(settings.get('text', '') or '')
+        opacity = int(max(0.0, min(1.0, float(settings.get('opacity', 0.5)))) * 255)
+        font_size = max(1, int(round(settings.get('size', 30) * scale)))
+        bold = bool(settings.get('bold', False))
+        italic = bool(settings.get('italic', False))
+        stroke_width = 0
+        if settings.get('stroke', False):
+            stroke_width = max(1, int(round(settings.get('stroke_width', 2) * scale)))
+
+        font, native_bold, native_italic = FontRegistry.default().load(
+            str(settings.get('font', '微软雅黑')), font_size, bold, italic)
+        # 字体文件与字体集合索引唯一确定字形；内置默认字体没有文件路径
+        font_path = getattr(font, 'path', None)
+        font_id = (font_path, getattr(font, 'index', 0)) if isinstance(font_path, str) else ('default', font_size)
+
+        # 栅格化字形蒙版，后续所有效果都复用这一份
+        glyph_mask = None
+        text_bbox = (0, 0, 0, 0)
+        if text.strip():
+            text_bbox = ImageDraw.Draw(Image.new('L', (1, 1))).textbbox((0, 0), text, font=font)
+            width, height = text_bbox[2] - text_bbox[0], text_bbox[3] - text_bbox[1]
+            glyph_mask = Image.new('L', (max(1, width), max(1, height)), 0)
+            ImageDraw.Draw(glyph_mask).text((-text_bbox[0], -text_bbox[1]), text, font=font, fill=255)
+
+        # 图片水印只解码一次（共享缓存），这里只计算按比例缩放后的尺寸
+        logo = logo_key = None
+        image_path = settings.get('image_path') if is_logo else None
+        if image_path:
+            logo = IMAGE_CACHE.load_logo(image_path)
+            if logo is None:
+                # 已指定图片水印却无法加载时不能静默导出不带水印的图片
+                raise IOError(f"无法加载水印图片: {image_path}")
+            logo_key = file_key(image_path)
+            logo_scale = max(0.01, float(settings.get('image_scale', 100)) / 100.0) * scale
+            text_bbox = (0, 0, max(1, int(round(logo.width * logo_scale))),
+                         max(1, int(round(logo.height * logo_scale))))
+
+        return RenderPlan(
+            text=text,
+            font_id=font_id,
+            font=font,
+            font_size=font_size,
+            fill=parse_color(settings.get('color', '#FFFFFF'), opacity),
+            stroke_fill=parse_color(settings.get('stroke_color', '#000000'), opacity, default=(0, 0, 0)),
+            stroke_width=stroke_width,
+            shadow=bool(settings.get('shadow', False)),
+            bold=bold and not native_bold,
+            italic=italic and not native_italic,
+            rotation=float(settings.get('rotation', 0) or 0),
+            h_position=float(settings.get('h_position', 0.5)),
+            v_position=float(settings.get('v_position', 0.5)),
+            style=settings.get('style', 'single'),
+            spacing=max(0, int(round(int(settings.get('spacing', 50)) * scale))),
+            text_bbox=text_bbox,
+            glyph_mask=glyph_mask,
+            logo=logo,
+            logo_key=logo_key,
+        )
+
+    @staticmethod
+    def render_stamp(plan: RenderPlan) -> Optional[Image.Image]:
+        """
+        根据渲染计划绘制带效果（阴影、描边、粗体、斜体、旋转）的水印图层
+
+        Args:
+            plan: 渲染计划
+
+        Returns:
+            Optional[Image.Image]: RGBA水印图层，没有水印内容时返回None
+        """
+        if plan.logo is not None:
+            return WatermarkRenderer.render_logo_stamp(plan)
+        if plan.glyph_mask is None:
+            return None
+
+        # 留白需容纳描边与模糊后的阴影
+        pad = max(STAMP_PADDING, plan.stroke_width + SHADOW_OFFSET + SHADOW_BLUR * 2 + 1)
+        size = (plan.glyph_mask.width + pad * 2, plan.glyph_mask.height + pad * 2)
+
+        # 所有效果都由同一份字形蒙版派生，耗时与描边宽度无关
+        fill_mask = Image.new('L', size, 0)
+        fill_mask.paste(plan.glyph_mask, (pad, pad))
+        if plan.bold:
+            # 粗体：字形向外扩张1像素
+            fill_mask = fill_mask.filter(ImageFilter.MaxFilter(3))
+        outline_mask = WatermarkRenderer._stroke_mask(plan, fill_mask, pad) if plan.stroke_width else fill_mask
+
+        stamp = Image.new('RGBA', size, (0, 0, 0, 0))
+        # 阴影：整体轮廓向右下方偏移并轻微模糊，半透明黑色
+        if plan.shadow:
+            shadow_mask = outline_mask.filter(ImageFilter.GaussianBlur(SHADOW_BLUR))
+            stamp.paste((0, 0, 0, plan.fill[3] // 2), (SHADOW_OFFSET, SHADOW_OFFSET), shadow_mask)
+        # 描边：字形加轮廓的整体形状，主文本随后覆盖在中间
+        if plan.stroke_width:
+            stamp.paste(plan.stroke_fill, (0, 0), outline_mask)
+        stamp.paste(plan.fill, (0, 0), fill_mask)
+
+        # 斜体：整体仿射变换，顶部向右倾斜
+        if plan.italic:
+            width, height = stamp.size
+            shift = int(height * ITALIC_SKEW)
+            stamp = stamp.transform((width + shift, height), Image.AFFINE,
+                                    (1, ITALIC_SKEW, -shift, 0, 1, 0),
+                                    resample=Image.BICUBIC, fillcolor=(0, 0, 0, 0))
+
+        if plan.rotation:
+            stamp = stamp.rotate(plan.rotation, resample=Image.BICUBIC, expand=True)
+
+        return stamp
+
+    @staticmethod
+    def _stroke_mask(plan: RenderPlan, fill_mask: Image.Image, pad: int) -> Image.Image:
+        """
+        生成字形加描边的整体蒙版
+
+        矢量字体直接由FreeType按描边宽度栅格化一次；
+        位图字体不支持描边，对主文本蒙版做一次形态学膨胀代替。
+        """
+        if isinstance(plan.font, ImageFont.FreeTypeFont):
+            # 模拟粗体时字形已扩张1像素，描边同样向外扩张，保持描边宽度不变
+            width = plan.stroke_width + (1 if plan.bold else 0)
+            mask = Image.new('L', fill_mask.size, 0)
+            ImageDraw.Draw(mask).text((pad - plan.text_bbox[0], pad - plan.text_bbox[1]), plan.text,
+                                      font=plan.font, fill=255, stroke_width=width, stroke_fill=255)
+            return mask
+        return fill_mask.filter(ImageFilter.MaxFilter(plan.stroke_width * 2 + 1))
+
+    @staticmethod
+    def render_logo_stamp(plan: RenderPlan) -> Image.Image:
+        """
+        将图片水印缩放到目标尺寸，并预先乘上透明度、完成旋转
+
+        结果按缩放档位缓存在图层缓存中，之后每张图片只需合成。
+
+        Args:
+            plan: 渲染计划（plan.logo不为None）
+
+        Returns:
+            Image.Image: RGBA水印图层
+        """
+        size = (plan.text_bbox[2], plan.text_bbox[3])
+        # RGBA缩放时Pillow内部按预乘alpha插值，透明边缘不会混入杂色
+        stamp = plan.logo.resize(size, Image.LANCZOS) if plan.logo.size != size else plan.logo.copy()
+
+        opacity = plan.fill[3]
+        if opacity < 255:
+            stamp.putalpha(stamp.getchannel('A').point([a * opacity // 255 for a in range(256)]))
+
+        if plan.rotation:
+            # 旋转在预乘alpha下插值，避免半透明边缘出现原本被透明像素掩盖的颜色
+            stamp = stamp.convert('RGBa').rotate(plan.rotation, resample=Image.BICUBIC, expand=True).convert('RGBA')
+        return stamp
+
+    @staticmethod
+    def render_pattern(plan: RenderPlan, stamp: Image.Image) -> Image.Image:
+        """
+        由水印图层生成可以无缝重复的图案单元
+
+        先裁掉图层四周的透明留白，相邻水印之间的距离即为间距。
+        tile样式每个单元一个水印；diagonal样式单元高度加倍，
+        第二行错开半个单元，使水印沿斜线排列。
+
+        Args:
+            plan: 渲染计划
+            stamp: RGBA水印图层
+
+        Returns:
+            Image.Image: RGBA图案单元
+        """
+        content = stamp.crop(stamp.getchannel('A').getbbox() or (0, 0, 1, 1))
+        cell_width = content.width + plan.spacing
+        cell_height = content.height + plan.spacing
+
+        if plan.style == 'diagonal':
+            pattern = Image.new('RGBA', (cell_width, cell_height * 2), (0, 0, 0, 0))
+            pattern.paste(content, (0, 0))
+            # 第二行超出右边界的部分绕回到左侧，保证左右拼接无缝
+            shift = cell_width // 2
+            pattern.paste(content, (shift, cell_height))
+            pattern.paste(content, (shift - cell_width, cell_height))
+        else:
+            pattern = Image.new('RGBA', (cell_width, cell_height), (0, 0, 0, 0))
+            pattern.paste(content, (0, 0))
+        return pattern
+
+    @staticmethod
+    def stamp_position(plan: RenderPlan, image_size: Tuple[int, int], stamp_size: Tuple[int, int]) -> Tuple[int, int]:
+        """
+        计算水印图层在图片中的左上角坐标
+
+        文本框按位置比例放置在图片内，水印图层以文本框中心对齐。
+
+        Args:
+            plan: 渲染计划
+            image_size: 图片尺寸 (width, height)
+            stamp_size: 水印图层尺寸 (width, height)
+
+        Returns:
+            Tuple[int, int]: 左上角坐标 (x, y)
+        """
+        left, top, right, bottom = plan.text_bbox
+        text_width, text_height = right - left, bottom - top
+        x = max(0, int((image_size[0] - text_width) * plan.h_position))
+        y = max(0, int((image_size[1] - text_height) * plan.v_position))
+        center_x = x + text_width // 2
+        center_y = y + text_height // 2
+        return center_x - stamp_size[0] // 2, center_y - stamp_size[1] // 2
+
+    def get_watermark_rect(self, image_size: Tuple[int, int]) -> Optional[Tuple[int, int, int, int]]:
+        """
+        获取水印在图片中的矩形区域
+
+        Args:
+            image_size: 图片尺寸 (width, height)
+
+        Returns:
+            Optional[Tuple[int, int, int, int]]: (x, y, width, height)，无水印时返回None
+        """
+        stamp = self.stamp
+        if stamp is None:
+            return None
+        x, y = self.stamp_position(self.plan, image_size, stamp.size)
+        return (x, y, stamp.width, stamp.height)
+
+    @staticmethod
+    def composite(image: Image.Image, stamp: Image.Image, position: Tuple[int, int]) -> None:
+        """
+        将水印图层原地合成到图片上，只处理两者相交的矩形区域
+
+        Args:
+            image: 目标图像（RGB、RGBA或L），会被直接修改
+            stamp: RGBA水印图层
+            position: 水印图层左上角在图片中的坐标，可以为负数或超出边界
+        """
+        x, y = position
+        left, top = max(0, x), max(0, y)
+        right = min(image.width, x + stamp.width)
+        bottom = min(image.height, y + stamp.height)
+        if right <= left or bottom <= top:
+            return
+
+        # 裁掉超出图片的部分，保证临时内存只与水印大小成正比
+        if (left, top, right, bottom) != (x, y, x + stamp.width, y + stamp.height):
+            stamp = stamp.crop((left - x, top - y, right - x, bottom - y))
+
+        # 按区域大小选择PIL或NumPy合成（见alpha_blend）
+        BLEND_BACKEND.blend(image, stamp, (left, top))
+
+    def _get_strip(self, pattern: Image.Image, width: int, phase_x: float, pitch_x: float) -> Image.Image:
+        """获取与图片等宽、由图案单元横向重复而成的一行图案，同尺寸图片之间复用"""
+        key = (width, phase_x, pitch_x)
+        if self._strip is None or self._strip[0] != key:
+            strip = Image.new('RGBA', (width, pattern.height), (0, 0, 0, 0))
+            x, index = phase_x, 0
+            while x < width:
+                # 缩放后的间距可能小于图案单元宽度，相邻单元需要叠加混合而不是覆盖，
+                # 否则后一单元的透明留白会擦掉前一单元的边缘
+                left = int(round(x))
+                source_left = max(0, -left)
+                source_right = min(pattern.width, width - left)
+                if source_right > source_left:
+                    strip.alpha_composite(pattern, (left + source_left, 0),
+                                          (source_left, 0, source_right, pattern.height))
+                index += 1
+                x = phase_x + index * pitch_x
+            self._strip = (key, strip)
+        return self._strip[1]
+
+    def _composite_pattern(self, image: Image.Image, stamp: Image.Image) -> None:
+        """
+        将平铺图案原地合成到整张图片上
+
+        图案以单个水印的位置为锚点，拖动位置时整体平移。
+        整行图案只生成一次，再按行高逐段合成，每个像素只混合一次，
+        耗时与水印重复次数无关。
+        """
+        pattern = self.get_pattern(self.plan)
+        left, top = self.stamp_position(self.plan, image.size, stamp.size)
+        bbox = stamp.getchannel('A').getbbox() or (0, 0, 1, 1)
+        pitch_x, pitch_y = self.pitch or pattern.size
+        # 锚点水印的左上角对齐图案单元的左上角，相位取非正值保证左上边缘也被覆盖
+        phase_x = (left + bbox[0]) % pitch_x - pitch_x
+        phase_y = (top + bbox[1]) % pitch_y - pitch_y
+
+        strip = self._get_strip(pattern, image.width, phase_x, pitch_x)
+        # 间距为小数时逐行取整定位，偏差不会累积
+        y, index = phase_y, 0
+        while y < image.height:
+            self.composite(image, strip, (0, int(round(y))))
+            index += 1
+            y = phase_y + index * pitch_y
+
+    @staticmethod
+    def output_mode(image: Image.Image) -> str:
+        """
+        获取添加水印后的图像模式
+
+        Args:
+            image: 原始图像
+
+        Returns:
+            str: 带透明通道的图片返回'RGBA'，其余返回'RGB'
+        """
+        has_alpha = image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+        return 'RGBA' if has_alpha else 'RGB'
+
+    def render(self, image: Image.Image) -> Image.Image:
+        """
+        将水印应用到图片上，不修改原图
+
+        Args:
+            image: 原始图像
+
+        Returns:
+            Image.Image: 带水印的图像（带透明通道的图片返回RGBA，其余返回RGB）
+        """
+        output_mode = self.output_mode(image)
+        watermarked = image.convert(output_mode) if image.mode != output_mode else image.copy()
+
+        stamp = self.stamp
+        if stamp is not None:
+            if self.plan.style in TILE_STYLES:
+                self._composite_pattern(watermarked, stamp)
+            else:
+                position = self.stamp_position(self.plan, watermarked.size, stamp.size)
+                self.composite(watermarked, stamp, position)
+        return watermarked
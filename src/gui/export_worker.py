@@ -0,0 +1,56 @@
+# src/gui/export_worker.py
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ExportWorker(QThread):
+    """
+    后台导出线程，在GUI线程之外驱动BatchExporter，逐张汇报进度
+    """
+    # 已完成数量, 总数, 速度(张/秒), 预计剩余秒数
+    progress = pyqtSignal(int, int, float, float)
+    # 单张图片的导出结果(ExportResult)
+    result_ready = pyqtSignal(object)
+    # 成功数量, 已处理数量, 总数, 是否被取消
+    export_finished = pyqtSignal(int, int, int, bool)
+
+    def __init__(self, exporter, image_paths, parent=None):
+        """
+        Args:
+            exporter: BatchExporter实例
+            image_paths: 要导出的图片路径列表
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.exporter = exporter
+        self.image_paths = list(image_paths)
+
+    def cancel(self):
+        """请求取消：当前正在处理的图片完成后停止"""
+        self.exporter.cancel()
+
+    def run(self):
+        """线程入口，逐个接收导出结果并发出进度信号"""
+        total = len(self.image_paths)
+        done = 0
+        success_count = 0
+        start = time.perf_counter()
+        try:
+            for result in self.exporter.iter_results(self.image_paths):
+                done += 1
+                if result.success:
+                    success_count += 1
+                self.result_ready.emit(result)
+
+                elapsed = max(time.perf_counter() - start, 1e-6)
+                throughput = done / elapsed
+                eta = (total - done) / throughput if throughput > 0 else 0.0
+                self.progress.emit(done, total, throughput, eta)
+        except Exception:
+            logger.exception("导出过程异常")
+        self.export_finished.emit(success_count, done, total, self.exporter.cancelled)
@@ -0,0 +1,64 @@
+# src/gui/folder_scan_worker.py
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from src.core.file_handler import FileHandler
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 每批最多包含的路径数量
+BATCH_SIZE = 500
+# 距上一批超过这一时间(秒)时立即发出，保证列表持续更新
+BATCH_INTERVAL = 0.1
+
+
+class FolderScanWorker(QThread):
+    """
+    后台文件夹扫描线程，扫描结果分批发出，列表无需等待扫描完成即可显示
+    """
+    # 一批图片路径(list)
+    images_found = pyqtSignal(list)
+    # 找到的图片总数
+    scan_finished = pyqtSignal(int)
+
+    def __init__(self, folder_path, parent=None):
+        """
+        Args:
+            folder_path: 要扫描的文件夹
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.folder_path = folder_path
+        self._stopped = False
+
+    def stop(self):
+        """请求停止扫描"""
+        self._stopped = True
+
+    def run(self):
+        """线程入口"""
+        batch = []
+        total = 0
+        last_emit = time.monotonic()
+        scanner = FileHandler.iter_images_from_folder(self.folder_path)
+        try:
+            for file_path in scanner:
+                if self._stopped:
+                    break
+                batch.append(file_path)
+                now = time.monotonic()
+                if len(batch) >= BATCH_SIZE or now - last_emit >= BATCH_INTERVAL:
+                    total += len(batch)
+                    self.images_found.emit(batch)
+                    batch = []
+                    last_emit = now
+        except Exception:
+            logger.exception("扫描文件夹失败: %s", self.folder_path)
+        finally:
+            scanner.close()
+        if batch:
+            total += len(batch)
+            self.images_found.emit(batch)
+        self.scan_finished.emit(total)
@@ -0,0 +1,140 @@
+# src/gui/image_list_model.py
+import os
+from collections import OrderedDict
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QSize, Qt
+from PyQt5.QtGui import QIcon, QPixmap
+
+# 列表中显示的文件名最大长度
+MAX_NAME_LENGTH = 30
+# 内存中最多保留的缩略图图标数量，滚动离开的图标超出后被淘汰，需要时重新加载
+MAX_CACHED_ICONS = 2000
+
+
+def elide_filename(filename, max_length=MAX_NAME_LENGTH):
+    """
+    截断过长的文件名，保留开头和扩展名
+
+    Args:
+        filename: 文件名
+        max_length: 最大长度
+
+    Returns:
+        str: 截断后的文件名
+    """
+    if len(filename) <= max_length:
+        return filename
+    name_part, ext_part = os.path.splitext(filename)
+    if len(ext_part) >= max_length / 2:
+        # 如果扩展名本身就很长，直接截断
+        return filename[:max_length - 3] + "..."
+    # 保留文件名开头和扩展名，中间用省略号
+    name_part_length = max_length - len(ext_part) - 3
+    return name_part[:name_part_length] + "..." + ext_part
+
+
+class ImageListModel(QAbstractListModel):
+    """
+    图片列表数据模型
+
+    只保存路径列表和 路径->行号 索引，判断重复为O(1)；
+    缩略图只在视图请求可见行时才加载，内存中的图标数量有上限。
+    """
+
+    def __init__(self, thumbnail_loader, placeholder_icon, parent=None):
+        """
+        Args:
+            thumbnail_loader: ThumbnailLoader，异步生成缩略图
+            placeholder_icon: 缩略图生成前显示的占位图标
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._paths = []
+        self._rows = {}
+        self._icons = OrderedDict()
+        self._requested = set()
+        self._placeholder_icon = placeholder_icon
+        self._thumbnail_loader = thumbnail_loader
+        self._thumbnail_loader.thumbnail_ready.connect(self._on_thumbnail_ready)
+
+    @property
+    def paths(self):
+        """所有图片路径（只读，按添加顺序）"""
+        return self._paths
+
+    def contains(self, file_path):
+        """判断图片是否已在列表中"""
+        return file_path in self._rows
+
+    def add_paths(self, file_paths):
+        """
+        批量添加图片，已存在的路径会被跳过
+
+        Args:
+            file_paths: 图片路径的可迭代对象
+
+        Returns:
+            int: 实际添加的数量
+        """
+        new_paths = []
+        seen = set()
+        for file_path in file_paths:
+            if file_path not in self._rows and file_path not in seen:
+                seen.add(file_path)
+                new_paths.append(file_path)
+        if not new_paths:
+            return 0
+
+        first = len(self._paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_paths) - 1)
+        for row, file_path in enumerate(new_paths, first):
+            self._paths.append(file_path)
+            self._rows[file_path] = row
+        self.endInsertRows()
+        return len(new_paths)
+
+    def path_at(self, row):
+        """获取指定行的图片路径"""
+        return self._paths[row] if 0 <= row < len(self._paths) else None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._paths)):
+            return None
+        file_path = self._paths[index.row()]
+        if role == Qt.DisplayRole:
+            return elide_filename(os.path.basename(file_path))
+        if role == Qt.DecorationRole:
+            return self._icon_for(file_path)
+        if role in (Qt.ToolTipRole, Qt.UserRole):
+            return file_path
+        if role == Qt.SizeHintRole:
+            return QSize(200, 80)
+        return None
+
+    def _icon_for(self, file_path):
+        """获取图标；视图只请求可见行，此时才提交缩略图加载"""
+        icon = self._icons.get(file_path)
+        if icon is not None:
+            self._icons.move_to_end(file_path)
+            return icon
+        if file_path not in self._requested:
+            self._requested.add(file_path)
+            self._thumbnail_loader.request(file_path)
+        return self._placeholder_icon
+
+    def _on_thumbnail_ready(self, file_path, q_image):
+        """缩略图生成完成，缓存图标并刷新对应行"""
+        self._requested.discard(file_path)
+        row = self._rows.get(file_path)
+        if row is None:
+            return
+        icon = QIcon(QPixmap.fromImage(q_image)) if q_image is not None else self._placeholder_icon
+        self._icons[file_path] = icon
+        self._icons.move_to_end(file_path)
+        while len(self._icons) > MAX_CACHED_ICONS:
+            self._icons.popitem(last=False)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DecorationRole])
@@ -1,9 +1,14 @@
 # src/gui/image_list_panel.py
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QListWidget, QListWidgetItem,
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QListView,
                              QLabel, QPushButton, QFileDialog, QFrame)
-from PyQt5.QtGui import QPixmap, QIcon
+from PyQt5.QtGui import QPixmap, QIcon, QColor
 from PyQt5.QtCore import Qt, QSize
-import os
+from src.gui.folder_scan_worker import FolderScanWorker
+from src.gui.image_list_model import ImageListModel
+from src.gui.thumbnail_loader import ThumbnailLoader
+
+# 列表缩略图尺寸
+THUMBNAIL_SIZE = (60, 60)
 
 class ImageListPanel(QWidget):
     """
@@ -11,9 +16,18 @@ class ImageListPanel(QWidget):
     """
     def __init__(self):
         super().__init__()
-        self.image_paths = []
+        # 缩略图在后台线程池中生成，只加载可见行，完成后逐个更新图标
+        self.thumbnail_loader = ThumbnailLoader(THUMBNAIL_SIZE, self)
+        self.model = ImageListModel(self.thumbnail_loader, self._create_placeholder_icon(), self)
+        # 正在进行的文件夹扫描线程
+        self._scan_workers = []
         self.init_ui()
     
+    @property
+    def image_paths(self):
+        """列表中所有图片路径（只读，添加图片请使用add_image_paths）"""
+        return self.model.paths
+    
     def init_ui(self):
         """初始化图片列表面板UI"""
         layout = QVBoxLayout(self)
@@ -41,24 +55,25 @@ class ImageListPanel(QWidget):
         
         layout.addLayout(buttons_layout)
         
-        # 创建图片列表 - 使用ListMode确保缩略图居左显示
-        self.image_list = QListWidget()
-        self.image_list.setIconSize(QSize(60, 60))
-        # 切换到ListMode而不是IconMode，这样图标和文本会水平排列且默认居左
-        self.image_list.setViewMode(QListWidget.ListMode)
+        # 创建图片列表 - 使用模型/视图，只为可见行创建图标
+        self.image_list = QListView()
+        self.image_list.setModel(self.model)
+        self.image_list.setIconSize(QSize(*THUMBNAIL_SIZE))
+        # 使用ListMode，图标和文本水平排列且默认居左
+        self.image_list.setViewMode(QListView.ListMode)
         # 设置为单列布局，垂直排列
-        self.image_list.setFlow(QListWidget.TopToBottom)
+        self.image_list.setFlow(QListView.TopToBottom)
         # 隐藏水平滚动条，防止文件名过长时显示滚动条
         self.image_list.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         # 启用项目文本的省略显示
         self.image_list.setTextElideMode(Qt.ElideMiddle)
         # 设置列表项的大小提示
         self.image_list.setMinimumWidth(220)
-        # 允许列表项填充整个宽度
+        # 所有行等高，布局与滚动时不需要逐行查询尺寸
         self.image_list.setUniformItemSizes(True)
         
         # 连接双击事件，用于切换当前处理的图片
-        self.image_list.itemDoubleClicked.connect(self.on_item_double_clicked)
+        self.image_list.doubleClicked.connect(self.on_item_double_clicked)
         
         # 添加分割线
         line = QFrame()
@@ -75,10 +90,7 @@ class ImageListPanel(QWidget):
             self, "选择图片", "", "图片文件 (*.png *.jpg *.jpeg *.bmp *.gif *.tiff *.tif);;所有文件 (*)", options=options
         )
         
-        for file_path in files:
-            if file_path not in self.image_paths:
-                self.image_paths.append(file_path)
-                self._add_image_to_list(file_path)
+        self.add_image_paths(files)
     
     def add_folder(self):
         """添加文件夹中的所有图片"""
@@ -86,54 +98,69 @@ class ImageListPanel(QWidget):
         folder_path = QFileDialog.getExistingDirectory(self, "选择文件夹", "", options=options)
         
         if folder_path:
-            # 支持的图片格式
-            image_extensions = ['.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tiff', '.tif']
-            
-            # 遍历文件夹中的所有文件
-            for root, _, files in os.walk(folder_path):
-                for file in files:
-                    if any(file.lower().endswith(ext) for ext in image_extensions):
-                        file_path = os.path.join(root, file)
-                        if file_path not in self.image_paths:
-                            self.image_paths.append(file_path)
-                            self._add_image_to_list(file_path)
+            self.scan_folder(folder_path)
     
-    def _add_image_to_list(self, file_path):
-        """将图片添加到列表控件中"""
-        # 创建缩略图
-        pixmap = QPixmap(file_path)
-        scaled_pixmap = pixmap.scaled(60, 60, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    def scan_folder(self, folder_path):
+        """
+        在后台线程中扫描文件夹，找到的图片分批加入列表
         
-        # 获取文件名并处理过长的情况
-        filename = os.path.basename(file_path)
-        # 限制文件名长度，如果超过30个字符则截断并添加省略号
-        max_length = 30
-        if len(filename) > max_length:
-            # 保留扩展名，截断中间部分
-            name_part, ext_part = os.path.splitext(filename)
-            if len(ext_part) >= max_length / 2:
-                # 如果扩展名本身就很长，直接截断
-                filename = filename[:max_length-3] + "..."
-            else:
-                # 保留文件名开头和扩展名，中间用省略号
-                name_part_length = max_length - len(ext_part) - 3
-                filename = name_part[:name_part_length] + "..." + ext_part
-        
-        # 创建列表项 - 设置合适的大小提示
-        item = QListWidgetItem(QIcon(scaled_pixmap), filename)
-        item.setData(Qt.UserRole, file_path)
-        item.setToolTip(file_path)  # 添加工具提示显示完整路径
+        Args:
+            folder_path: 文件夹路径
+        """
+        worker = FolderScanWorker(folder_path, self)
+        worker.images_found.connect(self.add_image_paths)
+        worker.finished.connect(lambda: self._on_scan_finished(worker))
+        self._scan_workers.append(worker)
+        worker.start()
+    
+    def _on_scan_finished(self, worker):
+        """扫描线程结束，释放线程对象"""
+        if worker in self._scan_workers:
+            self._scan_workers.remove(worker)
+        worker.deleteLater()
+    
+    def stop_scans(self):
+        """停止所有正在进行的扫描并等待线程退出（关闭窗口时调用）"""
+        for worker in list(self._scan_workers):
+            worker.stop()
+            worker.wait()
+    
+    def stop_thumbnails(self):
+        """撤销排队中的缩略图请求并等待正在生成的缩略图完成（关闭窗口时调用）"""
+        self.thumbnail_loader.clear()
+        self.thumbnail_loader.wait()
+    
+    def add_image_paths(self, file_paths):
+        """
+        批量添加图片到列表，已存在的图片会被跳过
         
-        # 设置项的大小提示，确保有足够空间显示
-        item.setSizeHint(QSize(200, 80))
+        Args:
+            file_paths: 图片路径列表
         
-        self.image_list.addItem(item)
+        Returns:
+            int: 实际添加的数量
+        """
+        return self.model.add_paths(file_paths)
+    
+    def contains(self, file_path):
+        """判断图片是否已在列表中（O(1)）"""
+        return self.model.contains(file_path)
+    
+    def _add_image_to_list(self, file_path):
+        """将单张图片添加到列表中（兼容旧接口）"""
+        self.add_image_paths([file_path])
+    
+    def _create_placeholder_icon(self):
+        """创建缩略图生成前显示的占位图标"""
+        pixmap = QPixmap(*THUMBNAIL_SIZE)
+        pixmap.fill(QColor('#e0e0e0'))
+        return QIcon(pixmap)
     
-    def on_item_double_clicked(self, item):
+    def on_item_double_clicked(self, index):
         """处理列表项双击事件，切换当前处理的图片"""
         # 获取图片路径
-        image_path = item.data(Qt.UserRole)
+        image_path = self.model.path_at(index.row())
         if image_path:
             # 通知主窗口切换当前处理的图片
             if hasattr(self, 'main_window') and hasattr(self.main_window, 'on_image_double_clicked'):
-                self.main_window.on_image_double_clicked(image_path)
\ No newline at end of file
+                self.main_window.on_image_double_clicked(image_path)
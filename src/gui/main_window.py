@@ -105,11 +105,8 @@ class MainWindow(QMainWindow):
         """
         处理图片选择事件，将选中的图片添加到图片列表
         """
-        # 检查图片是否已在列表中
-        if image_path not in self.image_list_panel.image_paths:
-            # 添加图片到列表
-            self.image_list_panel.image_paths.append(image_path)
-            self.image_list_panel._add_image_to_list(image_path)
+        # 添加图片到列表，已在列表中的图片会被跳过
+        self.image_list_panel.add_image_paths([image_path])
     
     def on_image_double_clicked(self, image_path):
         """
@@ -155,7 +152,18 @@ class MainWindow(QMainWindow):
         # 使用QTimer延迟一点时间，确保所有尺寸都已正确设置
         from PyQt5.QtCore import QTimer
         QTimer.singleShot(100, self._apply_final_sizes)
-    
+
+    def closeEvent(self, event):
+        """
+        窗口关闭事件，先停止导出、后台扫描、缩略图与预览渲染线程，避免线程在对象销毁后继续运行
+        """
+        self.toolbar.stop_export()
+        self.image_list_panel.stop_scans()
+        self.image_list_panel.stop_thumbnails()
+        self.preview_panel.preview_scheduler.cancel()
+        self.preview_panel.preview_scheduler.wait()
+        super().closeEvent(event)
+
     def update_splitter_sizes(self):
         """
         根据窗口宽度按比例更新分割器大小
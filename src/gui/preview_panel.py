@@ -1,14 +1,34 @@
 # src/gui/preview_panel.py
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QHBoxLayout,
                              QPushButton, QFrame, QScrollArea, QSplitter, QFileDialog)
-from PyQt5.QtGui import QPixmap, QImage
+from PyQt5.QtGui import QPixmap, QImage, QPainter
 from PyQt5.QtCore import Qt, QUrl
 from src.core.image_processor import ImageProcessor
 from src.core.file_handler import FileHandler
+from src.core.image_cache import IMAGE_CACHE
+from src.core.watermark_renderer import TILE_STYLES, WatermarkRenderer
+from src.gui.qt_image import pil_to_qpixmap
+from src.gui.preview_scheduler import PreviewScheduler
+from src.utils.logger import get_logger
 import os
 from io import BytesIO
-import traceback
+from typing import NamedTuple
 
+logger = get_logger(__name__)
+
+
+# 水印效果预览的显示尺寸
+PREVIEW_SIZE = (350, 250)
+# 预览代理图像的解码尺寸，原图预览与水印预览共用同一份
+PROXY_SIZE = (540, 440)
+
+
+class DragOverlay(NamedTuple):
+    """拖拽水印时使用的缓存：不带水印的底图与水印图层，均已缩放到显示尺寸"""
+    base: QPixmap
+    stamp: QPixmap
+    # 显示尺寸与代理图像尺寸之比
+    scale: float
 
 
 class PreviewPanel(QWidget):
@@ -34,6 +54,15 @@ class PreviewPanel(QWidget):
         self.watermark_rect = None  # 水印在预览图中的矩形区域
         # 新增属性：跟踪鼠标是否在水印区域上方
         self._is_mouse_over_watermark = False
+        # 最近一次显示的渲染结果，拖拽时的叠加层由它生成
+        self._preview_result = None
+        self._drag_overlay = None
+        # 拖拽中尚未提交的水印位置 (h, v)，松开鼠标时才写入设置
+        self._drag_position = None
+        
+        # 预览渲染调度器：合并连续请求，在后台线程渲染
+        self.preview_scheduler = PreviewScheduler(PROXY_SIZE, self)
+        self.preview_scheduler.preview_ready.connect(self._on_preview_ready)
         
 
         
@@ -248,8 +277,11 @@ class PreviewPanel(QWidget):
             return
         
         try:
-            # 使用QPixmap直接加载图片
-            pixmap = QPixmap(image_path)
+            # 从共享缓存获取预览尺寸的代理图像，不解码全分辨率原图
+            loaded = IMAGE_CACHE.load_proxy(image_path, PROXY_SIZE)
+            if loaded is None:
+                raise IOError(f"无法加载图片: {image_path}")
+            pixmap = pil_to_qpixmap(loaded[0])
             
             # 使用预览标签的实际固定大小进行缩放
             # 减去一些边距以确保图片完全可见
@@ -271,7 +303,7 @@ class PreviewPanel(QWidget):
             self.effect_preview.setText("")  # 清除文本
             
         except Exception as e:
-            print(f"设置预览图片失败: {e}")
+            logger.warning("设置预览图片失败 %s: %s", image_path, e)
             self.original_preview.setText("图片加载失败")
             self.effect_preview.setText("图片加载失败")
     
@@ -296,69 +328,60 @@ class PreviewPanel(QWidget):
             
     def update_watermark_preview(self):
         """
-        更新水印效果预览，使用与导出相同的设置和逻辑
+        请求更新水印效果预览，使用与导出相同的设置和逻辑
+        
+        渲染在后台线程中进行，连续的请求会被合并，完成后由_on_preview_ready显示。
         """
-        print("开始更新水印预览")
         # 确保有当前图片路径
         if not hasattr(self, 'current_image_path') or not self.current_image_path:
-            print("没有当前图片路径")
+            logger.debug("没有当前图片路径")
+            return
+        
+        # 从设置面板获取所有水印设置
+        settings = self._get_watermark_settings()
+        self.preview_scheduler.request(str(self.current_image_path), settings)
+    
+    def _on_preview_ready(self, result):
+        """
+        后台渲染完成，显示水印预览并更新水印判定区域
+        
+        Args:
+            result: PreviewResult
+        """
+        # 渲染期间已切换到其他图片时丢弃结果
+        if result.image_path != str(self.current_image_path):
+            return
+        # 拖拽单个水印期间由叠加层负责显示，只更新缓存的渲染结果
+        if self.is_dragging and not result.error and not self._is_tiled(result):
+            self._preview_result = result
+            self._drag_overlay = None
             return
         
         try:
-            # 修复Unicode路径处理
-            image_path = self.current_image_path
-            # 确保路径为字符串类型
-            image_path_str = str(image_path)
-            print(f"处理图片路径: {image_path_str}")
+            if result.error:
+                raise RuntimeError(result.error)
             
-            # 从设置面板获取所有水印设置
-            settings = self._get_watermark_settings()
-            
-            # 尝试直接使用toolbar中的_apply_watermark方法逻辑
-            from PIL import Image
-            
-            # 直接使用Image.open打开图片
-            image = Image.open(image_path_str)
-            # 确保图片是RGB模式
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-                
-            # 保存原始图像副本
-            self.original_image = image.copy()
-            
-            # 应用水印，获取水印图片和水印位置信息
-            watermarked, watermark_rect = self._apply_watermark(image, settings)
+            # 保存代理图像（来自共享缓存，只读）
+            self.original_image = result.proxy
+            watermarked = result.watermarked
+            watermark_rect = result.watermark_rect
             
             # 保存水印图像
-            self.watermark_image = watermarked.copy()
-            
-            # 保存水印图片以便调试
-            try:
-                debug_path = 'debug_watermarked.png'
-                watermarked.save(debug_path)
-                print(f"调试图片已保存到: {debug_path}")
-            except Exception as e:
-                print(f"保存调试图片失败: {str(e)}")
+            self.watermark_image = watermarked
+            self._preview_result = result
+            self._drag_overlay = None
             
             # 转换为QImage和QPixmap
             try:
                 width, height = watermarked.size
-                print(f"图片尺寸: {width}x{height}")
-                # 获取原始图像数据
-                data = watermarked.tobytes()
-                
-                # 创建QImage
-                q_image = QImage(data, width, height, 3 * width, QImage.Format_RGB888)
-                
-                # 转换为QPixmap
-                pixmap = QPixmap.fromImage(q_image)
+                # 转换为QPixmap（QImage已在后台线程中准备好）
+                pixmap = QPixmap.fromImage(result.q_image)
                 
                 # 显示水印图片
                 if hasattr(self, 'effect_preview'):
-                    print("显示水印预览")
                     # 缩放并显示
                     scaled_pixmap = pixmap.scaled(
-                        350, 250,  # 固定大小
+                        PREVIEW_SIZE[0], PREVIEW_SIZE[1],  # 固定大小
                         Qt.KeepAspectRatio, 
                         Qt.SmoothTransformation
                     )
@@ -367,21 +390,9 @@ class PreviewPanel(QWidget):
                     
                     # 计算缩放后的水印矩形位置
                     if watermark_rect:
-                        scale_x = scaled_pixmap.width() / width
-                        scale_y = scaled_pixmap.height() / height
-                        scaled_rect = (watermark_rect[0] * scale_x, watermark_rect[1] * scale_y, 
-                                      watermark_rect[2] * scale_x, watermark_rect[3] * scale_y)
-                        
-                        # 计算相对于预览标签的位置
-                        x_offset = (self.effect_preview.width() - scaled_pixmap.width()) // 2
-                        y_offset = (self.effect_preview.height() - scaled_pixmap.height()) // 2
-                        
-                        self.watermark_rect = (scaled_rect[0] + x_offset, scaled_rect[1] + y_offset, 
-                                              scaled_rect[2], scaled_rect[3])
-                        print(f"DEBUG: 水印矩形区域(预览窗口): {self.watermark_rect}")
-                        print(f"DEBUG: 预览窗口尺寸: {self.effect_preview.width()}x{self.effect_preview.height()}")
-                        print(f"DEBUG: 图片缩放后尺寸: {scaled_pixmap.width()}x{scaled_pixmap.height()}")
-                        print(f"DEBUG: 偏移量: ({x_offset}, {y_offset})")
+                        self.watermark_rect = self._map_watermark_rect(
+                            watermark_rect, (width, height), scaled_pixmap.size())
+                        logger.debug("水印矩形区域(预览窗口): %s", self.watermark_rect)
                     else:
                         # 当没有水印矩形时，根据设置的位置参数和水印属性计算更准确的水印判定区域
                         try:
@@ -432,9 +443,10 @@ class PreviewPanel(QWidget):
                             
                             # 设置临时水印矩形区域
                             self.watermark_rect = (temp_x, temp_y, estimated_width, estimated_height)
-                            print(f"DEBUG: 根据位置设置({h_position}, {v_position})和水印属性计算的临时水印矩形区域: {self.watermark_rect}")
+                            logger.debug("根据位置设置(%s, %s)和水印属性计算的临时水印矩形区域: %s",
+                                         h_position, v_position, self.watermark_rect)
                         except Exception as e:
-                            print(f"DEBUG: 计算临时水印矩形区域失败: {e}")
+                            logger.debug("计算临时水印矩形区域失败: %s", e)
                             # 降级到简单计算
                             try:
                                 settings = self._get_watermark_settings()
@@ -457,65 +469,153 @@ class PreviewPanel(QWidget):
                                 temp_y = max(0, min(temp_y, window_height - dynamic_height))
                                 
                                 self.watermark_rect = (temp_x, temp_y, dynamic_width, dynamic_height)
-                                print(f"DEBUG: 使用降级方案计算的临时水印矩形区域: {self.watermark_rect}")
+                                logger.debug("使用降级方案计算的临时水印矩形区域: %s", self.watermark_rect)
                             except:
                                 self.watermark_rect = None
                 else:
-                    print("没有effect_preview属性")
+                    logger.warning("没有effect_preview属性")
             except Exception as e:
-                print(f"DEBUG: 图像转换为QPixmap失败: {str(e)}")
+                logger.warning("图像转换为QPixmap失败: %s", e)
                 self.watermark_rect = None
         
-                # 降级方案：如果转换失败，直接显示调试图片
+                # 降级方案：如果转换失败，在GUI线程中直接从内存中的水印图像重新转换
                 try:
-                    from PyQt5.QtGui import QPixmap, QImage
-                    from PyQt5.QtCore import Qt
-                    
-                    debug_image_path = 'debug_watermarked.png'
-                    if os.path.exists(debug_image_path) and hasattr(self, 'effect_preview'):
-                        print(f"DEBUG: 降级方案：直接加载调试图片 {debug_image_path}")
-                        debug_pixmap = QPixmap(debug_image_path)
-                        scaled_pixmap = debug_pixmap.scaled(
+                    if hasattr(self, 'effect_preview'):
+                        fallback_pixmap = pil_to_qpixmap(watermarked)
+                        scaled_pixmap = fallback_pixmap.scaled(
                             self.effect_preview.size(), 
                             Qt.KeepAspectRatio,
                             Qt.SmoothTransformation
                         )
                         self.effect_preview.setPixmap(scaled_pixmap)
-                        print("降级方案：直接加载调试图片")
+                        logger.debug("降级方案：直接转换水印图像")
                 except Exception as inner_e:
-                    print(f"降级方案也失败: {str(inner_e)}")
+                    logger.warning("降级方案也失败: %s", inner_e)
                 # 无论如何都设置可拖拽光标
                 if hasattr(self, 'effect_preview'):
                     self.effect_preview.setCursor(Qt.OpenHandCursor)
         
         except Exception as e:
-            print(f"DEBUG: 更新水印预览时出错: {str(e)}")
+            logger.exception("更新水印预览时出错: %s", e)
             self.watermark_rect = None
     
             # 使用英文错误信息避免编码问题
             if hasattr(self, 'effect_preview'):
                 self.effect_preview.setText("Watermark preview error")
-            import traceback
-            traceback.print_exc()
             # 发生错误时至少显示原图
             if hasattr(self, 'effect_preview'):
                 try:
-                    from PyQt5.QtGui import QImage, QPixmap
-                    from PyQt5.QtCore import Qt
-                    
                     # 加载原图
                     q_image = QImage(self.current_image_path)
                     pixmap = QPixmap.fromImage(q_image)
-                    scaled_pixmap = pixmap.scaled(350, 250, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                    scaled_pixmap = pixmap.scaled(PREVIEW_SIZE[0], PREVIEW_SIZE[1], Qt.KeepAspectRatio, Qt.SmoothTransformation)
                     self.effect_preview.setPixmap(scaled_pixmap)
                 except Exception as inner_e:
-                    print(f"显示原图失败: {str(inner_e)}")
+                    logger.warning("显示原图失败: %s", inner_e)
                     self.effect_preview.setText("无法加载图片")
     
+    def _map_watermark_rect(self, rect, image_size, scaled_size):
+        """
+        将代理图像中的水印矩形换算为预览标签中的坐标
+
+        Args:
+            rect: 代理图像中的矩形 (x, y, width, height)
+            image_size: 代理图像尺寸 (width, height)
+            scaled_size: 缩放后位图的尺寸(QSize)
+
+        Returns:
+            tuple: 预览标签中的矩形 (x, y, width, height)
+        """
+        scale_x = scaled_size.width() / image_size[0]
+        scale_y = scaled_size.height() / image_size[1]
+        # 计算相对于预览标签的位置
+        x_offset = (self.effect_preview.width() - scaled_size.width()) // 2
+        y_offset = (self.effect_preview.height() - scaled_size.height()) // 2
+        return (rect[0] * scale_x + x_offset, rect[1] * scale_y + y_offset,
+                rect[2] * scale_x, rect[3] * scale_y)
+    
+    @staticmethod
+    def _is_tiled(result):
+        """渲染结果是否为平铺样式"""
+        return result is not None and result.plan is not None and result.plan.style in TILE_STYLES
+    
+    def _get_drag_overlay(self):
+        """
+        获取拖拽叠加层，第一次拖拽时由最近的渲染结果生成
+        
+        Returns:
+            DragOverlay: 叠加层，没有可用的渲染结果时返回None
+        """
+        result = self._preview_result
+        if self._drag_overlay is None and result is not None and result.stamp is not None:
+            base = pil_to_qpixmap(result.proxy).scaled(
+                PREVIEW_SIZE[0], PREVIEW_SIZE[1],
+                Qt.KeepAspectRatio,
+                Qt.SmoothTransformation
+            )
+            scale = base.width() / result.proxy.width
+            stamp = pil_to_qpixmap(result.stamp)
+            stamp = stamp.scaled(
+                max(1, round(stamp.width() * scale)), max(1, round(stamp.height() * scale)),
+                Qt.IgnoreAspectRatio,
+                Qt.SmoothTransformation
+            )
+            self._drag_overlay = DragOverlay(base, stamp, scale)
+        return self._drag_overlay
+    
+    def _show_drag_overlay(self, h_position, v_position):
+        """
+        拖拽时只把缓存的水印图层画到缓存的底图上，不重新解码和渲染图片
+        
+        Args:
+            h_position: 水平位置比例 (0-1)
+            v_position: 垂直位置比例 (0-1)
+        """
+        result = self._preview_result
+        if self._is_tiled(result):
+            # 平铺图案覆盖整张图片，直接请求后台渲染（预览尺寸的渲染很快，且会合并连续请求）
+            settings = dict(result.settings, h_position=h_position, v_position=v_position)
+            self.preview_scheduler.request(result.image_path, settings)
+            return
+        overlay = self._get_drag_overlay()
+        if overlay is None:
+            return
+        # 位置与完整渲染使用同一公式，松开鼠标后的结果不会跳动
+        plan = result.plan._replace(h_position=h_position, v_position=v_position)
+        x, y = WatermarkRenderer.stamp_position(plan, result.proxy.size, result.stamp.size)
+        
+        frame = overlay.base.copy()
+        painter = QPainter(frame)
+        painter.drawPixmap(round(x * overlay.scale), round(y * overlay.scale), overlay.stamp)
+        painter.end()
+        self.effect_preview.setPixmap(frame)
+        
+        # 同步更新水印判定区域
+        self.watermark_rect = self._map_watermark_rect(
+            (x, y, result.stamp.width, result.stamp.height), result.proxy.size, frame.size())
+    
+    def _commit_watermark_position(self):
+        """拖拽结束，将水印位置写入已应用的设置并重新渲染完整预览"""
+        if self._drag_position is None:
+            return
+        h_position, v_position = self._drag_position
+        self._drag_position = None
+        
+        settings_panel = None
+        if hasattr(self, 'main_window') and self.main_window:
+            settings_panel = getattr(self.main_window, 'settings_panel', None)
+        elif hasattr(self, 'parent') and self.parent:
+            settings_panel = getattr(self.parent, 'settings_panel', None)
+        
+        if settings_panel is not None and hasattr(settings_panel, 'set_applied_position'):
+            try:
+                settings_panel.set_applied_position(h_position, v_position)
+            except Exception as e:
+                logger.exception("保存水印位置失败: %s", e)
+        self.update_watermark_preview()
+    
     def on_mouse_press(self, event):
         """处理鼠标按下事件"""
-        print(f"DEBUG: 鼠标按下事件触发，按钮: {event.button()}, 位置: ({event.pos().x()}, {event.pos().y()})")
-        
         # 确保effect_preview存在
         if not hasattr(self, 'effect_preview') or self.effect_preview is None:
 
@@ -537,8 +637,7 @@ class PreviewPanel(QWidget):
                 # 直接调用update_watermark_position方法
                 self._update_watermark_position(event.pos())
             except Exception as e:
-                print(f"DEBUG: 点击时更新位置出错: {e}")
-                traceback.print_exc()
+                logger.exception("点击时更新位置出错: %s", e)
         else:
             if event.button() == Qt.LeftButton:
                 pass
@@ -548,163 +647,28 @@ class PreviewPanel(QWidget):
         
     
     def _update_watermark_position(self, pos):
-        """更新水印位置的辅助方法，实现实时拖拽预览并更新判定区域"""
-        print(f"DEBUG: 更新水印位置，鼠标坐标: ({pos.x()}, {pos.y()})")
-        
+        """
+        拖拽中更新水印位置：只移动缓存的水印叠加层，松开鼠标时再提交设置并完整渲染
+        """
         # 首先检查effect_preview是否存在且有效
         if not hasattr(self, 'effect_preview') or self.effect_preview is None:
-    
             return
         
         # 获取预览窗口尺寸
         window_width = self.effect_preview.width()
         window_height = self.effect_preview.height()
-        mouse_x = pos.x()
-        mouse_y = pos.y()
-        print(f"DEBUG: 预览窗口尺寸: ({window_width}, {window_height})")
-        
         if window_width <= 0 or window_height <= 0:
-    
             return
         
         # 转换为0-1的坐标比例（更适合直接用于图像绘制）
-        h_ratio = min(1.0, max(0.0, mouse_x / window_width))
-        v_ratio = min(1.0, max(0.0, mouse_y / window_height))
-        print(f"DEBUG: 转换为比例位置: ({h_ratio}, {v_ratio})")
-        
-        # 转换为0-100的百分比整数（用于设置面板）
-        h_percent = int(h_ratio * 100)
-        v_percent = int(v_ratio * 100)
-        print(f"DEBUG: 转换为百分比位置: ({h_percent}, {v_percent})")
-        
-        # 步骤1: 更新设置（确保持久化）
-        try:
-            # 获取当前设置
-            settings = self._get_watermark_settings()
-            
-            # 更新为新位置
-            settings['h_position'] = h_ratio
-            settings['v_position'] = v_ratio
-            print(f"DEBUG: 已更新设置: h_position={h_ratio}, v_position={v_ratio}")
-        except Exception as e:
-            print(f"DEBUG: 更新设置失败: {e}")
-        
-        # 步骤2: 更新设置面板中的位置（持久化设置）
-        # 方式1: 通过main_window获取settings_panel
-        settings_updated = False
-        if hasattr(self, 'main_window') and self.main_window:
-    
-            if hasattr(self.main_window, 'settings_panel') and self.main_window.settings_panel:
-                settings_panel = self.main_window.settings_panel
-                
-                try:
-                    # 更新水平位置滑块
-                    if hasattr(settings_panel, 'horizontal_position_slider') and settings_panel.horizontal_position_slider:
-                        settings_panel.horizontal_position_slider.setValue(h_percent)
-                        
-                    # 更新垂直位置滑块
-                    if hasattr(settings_panel, 'vertical_position_slider') and settings_panel.vertical_position_slider:
-                        settings_panel.vertical_position_slider.setValue(v_percent)
-                        
-                    print(f"DEBUG: 直接更新settings_panel滑块值: h={h_percent}, v={v_percent}")
-                    settings_updated = True
-                except Exception as e:
-                    print(f"DEBUG: 更新settings_panel滑块失败: {e}")
-                    
-                # 尝试使用预设位置方法
-                if hasattr(settings_panel, 'set_preset_position'):
-                    try:
-                        print(f"DEBUG: 调用main_window.settings_panel.set_preset_position({h_percent}, {v_percent})")
-                        settings_panel.set_preset_position(h_percent, v_percent)
-                        settings_updated = True
-                    except Exception as e:
-                        print(f"DEBUG: 调用set_preset_position失败: {e}")
-            else:
-                pass
-        
-        # 方式2: 通过parent获取settings_panel
-        elif hasattr(self, 'parent') and self.parent:
-    
-            if hasattr(self.parent, 'settings_panel') and self.parent.settings_panel:
-                settings_panel = self.parent.settings_panel
-                
-                try:
-                    # 更新水平位置滑块
-                    if hasattr(settings_panel, 'horizontal_position_slider') and settings_panel.horizontal_position_slider:
-                        settings_panel.horizontal_position_slider.setValue(h_percent)
-                        
-                    # 更新垂直位置滑块
-                    if hasattr(settings_panel, 'vertical_position_slider') and settings_panel.vertical_position_slider:
-                        settings_panel.vertical_position_slider.setValue(v_percent)
-                        
-                    print(f"DEBUG: 直接更新parent.settings_panel滑块值: h={h_percent}, v={v_percent}")
-                    settings_updated = True
-                except Exception as e:
-                    print(f"DEBUG: 更新parent.settings_panel滑块失败: {e}")
-                    
-                # 尝试使用预设位置方法
-                if hasattr(settings_panel, 'set_preset_position'):
-                    try:
-                        print(f"DEBUG: 调用parent.settings_panel.set_preset_position({h_percent}, {v_percent})")
-                        settings_panel.set_preset_position(h_percent, v_percent)
-                        settings_updated = True
-                    except Exception as e:
-                        print(f"DEBUG: 调用set_preset_position失败: {e}")
-            else:
-                pass
+        h_ratio = min(1.0, max(0.0, pos.x() / window_width))
+        v_ratio = min(1.0, max(0.0, pos.y() / window_height))
         
-        # 步骤3: 立即刷新预览（确保水印位置更新并更新判定区域）
-        try:
-    
-            self.update_watermark_preview()
-            
-            # 确保update_watermark_preview后有足够时间更新watermark_rect
-            # 检查是否成功更新了水印矩形区域
-            if hasattr(self, 'watermark_rect') and self.watermark_rect is not None:
-                print(f"DEBUG: 水印矩形区域已更新为: {self.watermark_rect}")
-            else:
-        
-                
-                # 直接计算一个合理的水印区域作为临时方案
-                # 假设水印大小为预览窗口的1/3
-                temp_width = max(50, window_width // 3)
-                temp_height = max(30, window_height // 3)
-                
-                # 计算基于鼠标位置的水印区域
-                temp_x = mouse_x - temp_width // 2
-                temp_y = mouse_y - temp_height // 2
-                
-                # 确保不超出窗口边界
-                temp_x = max(0, min(temp_x, window_width - temp_width))
-                temp_y = max(0, min(temp_y, window_height - temp_height))
-                
-                # 直接设置临时水印矩形区域
-                self.watermark_rect = (temp_x, temp_y, temp_width, temp_height)
-                print(f"DEBUG: 已设置临时水印矩形区域: {self.watermark_rect}")
-            
-        except Exception as e:
-            print(f"DEBUG: 刷新预览失败: {e}")
-            traceback.print_exc()
-            
-            # 出错时，使用直接计算的临时水印区域
-            try:
-                temp_width = max(50, window_width // 3)
-                temp_height = max(30, window_height // 3)
-                temp_x = mouse_x - temp_width // 2
-                temp_y = mouse_y - temp_height // 2
-                temp_x = max(0, min(temp_x, window_width - temp_width))
-                temp_y = max(0, min(temp_y, window_height - temp_height))
-                self.watermark_rect = (temp_x, temp_y, temp_width, temp_height)
-                print(f"DEBUG: 出错时设置临时水印矩形区域: {self.watermark_rect}")
-            except:
-                pass
-        
-        print(f"DEBUG: 水印位置更新完成，设置更新状态: {settings_updated}")
+        self._drag_position = (h_ratio, v_ratio)
+        self._show_drag_overlay(h_ratio, v_ratio)
     
     def on_mouse_move(self, event):
         """处理鼠标移动事件"""
-        print(f"DEBUG: 鼠标移动事件触发，位置: ({event.pos().x()}, {event.pos().y()})")
-        
         # 确保effect_preview存在
         if not hasattr(self, 'effect_preview') or self.effect_preview is None:
 
@@ -713,12 +677,10 @@ class PreviewPanel(QWidget):
         # 检查鼠标是否在水印区域内
         is_over_watermark = self._is_point_in_watermark(event.pos())
         self._is_mouse_over_watermark = is_over_watermark
-        print(f"DEBUG: 鼠标在水印区域内: {is_over_watermark}")
         
         # 检查拖拽状态
         is_dragging = hasattr(self, 'is_dragging') and self.is_dragging
         has_last_pos = hasattr(self, 'last_pos') and self.last_pos
-        print(f"DEBUG: is_dragging: {is_dragging}, has_last_pos: {has_last_pos}")
         
         if is_dragging and has_last_pos:
 
@@ -728,10 +690,8 @@ class PreviewPanel(QWidget):
                 self._update_watermark_position(event.pos())
                 # 更新last_pos
                 self.last_pos = event.pos()
-                print(f"DEBUG: 更新last_pos到: ({event.pos().x()}, {event.pos().y()})")
             except Exception as e:
-                print(f"DEBUG: 更新水印位置时出错: {e}")
-                traceback.print_exc()
+                logger.exception("更新水印位置时出错: %s", e)
         else:
             # 根据鼠标是否在水印区域来改变光标样式
             if is_over_watermark:
@@ -743,12 +703,11 @@ class PreviewPanel(QWidget):
     
     def on_mouse_release(self, event):
         """处理鼠标释放事件"""
-        print(f"DEBUG: 鼠标释放事件触发，按钮: {event.button()}")
-        
         if event.button() == Qt.LeftButton and hasattr(self, 'is_dragging') and self.is_dragging:
             
             self.is_dragging = False
             self.last_pos = None
+            self._commit_watermark_position()
             if hasattr(self, 'effect_preview'):
                 # 释放后根据鼠标位置设置光标
                 if self._is_point_in_watermark(event.pos()):
@@ -760,8 +719,6 @@ class PreviewPanel(QWidget):
     
     def on_mouse_double_click(self, event):
         """处理鼠标双击事件，重置水印位置到中心"""
-        print(f"DEBUG: 鼠标双击事件触发，位置: ({event.pos().x()}, {event.pos().y()})")
-        
         if hasattr(self, 'parent') and self.parent and hasattr(self.parent, 'settings_panel'):
             settings_panel = self.parent.settings_panel
             if hasattr(settings_panel, 'set_preset_position'):
@@ -781,12 +738,9 @@ class PreviewPanel(QWidget):
                 # 使用已应用的设置
                 if hasattr(panel, 'get_applied_settings'):
                     settings = panel.get_applied_settings()
-                    print(f"DEBUG: 成功获取已应用设置: {settings}")
                     return settings
             except Exception as e:
-                print(f"DEBUG: 获取已应用设置失败: {str(e)}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("获取已应用设置失败: %s", e)
         
         # 默认设置作为备用
         return {
@@ -804,475 +758,6 @@ class PreviewPanel(QWidget):
             'quality': 90
         }
     
-    def _apply_watermark(self, image, settings):
-        """
-        应用水印到图片上，使用与toolbar.py相同的逻辑
-        
-        Returns:
-            tuple: (watermarked_image, watermark_rect) - 水印图片和水印位置矩形
-        """
-        import traceback
-
-        print(f"设置内容: {settings}")
-        
-        # 直接测试颜色转换逻辑
-        color_str = settings.get('color', '#FFFFFF')
-        opacity = int(settings.get('opacity', 0.5) * 255)
-        print(f"\n===== 直接颜色测试开始 =====")
-        print(f"输入颜色: {color_str}, 不透明度: {opacity}")
-        
-        try:
-            # 移除#号（如果有）
-            color_str = str(color_str).lstrip('#')
-            print(f"处理后颜色字符串: {color_str}")
-            # 转换为RGB
-            r = int(color_str[0:2], 16)
-            g = int(color_str[2:4], 16)
-            b = int(color_str[4:6], 16)
-            print(f"RGB值: R={r}, G={g}, B={b}")
-            # 创建RGBA颜色
-            test_color = (r, g, b, opacity)
-            print(f"测试颜色转换结果: {test_color}")
-        except Exception as e:
-            print(f"测试颜色转换失败: {type(e).__name__}: {e}")
-        
-        # 尝试调用设置面板中可能存在的apply_watermark方法
-        if hasattr(self, 'main_window') and hasattr(self.main_window, 'settings_panel'):
-            panel = self.main_window.settings_panel
-            if hasattr(panel, 'apply_watermark'):
-                try:
-                    print("尝试使用设置面板的apply_watermark方法")
-                    result = panel.apply_watermark(image, settings)
-                    # 兼容原有的单返回值和新的双返回值
-                    if isinstance(result, tuple) and len(result) == 2:
-                        return result
-                    else:
-                        return result, None  # 原方法只返回图片，位置信息为None
-                except UnicodeEncodeError as e:
-                    print(f"设置面板的apply_watermark方法出现编码错误(UnicodeEncodeError): {e}")
-                    print("检测到中文字符编码问题，直接使用本地面板的水印实现")
-                    # 直接跳过，使用本地实现
-                except Exception as e:
-                    print(f"设置面板的apply_watermark方法失败: {type(e).__name__}: {e}")
-                    # 记录但继续使用本地实现
-        
-        # 如果设置面板没有提供方法，则使用默认实现
-        try:
-            from PIL import Image, ImageDraw, ImageFont
-            import os
-            import sys
-            
-            # 创建图像副本
-            watermarked = image.copy()
-            draw = ImageDraw.Draw(watermarked)
-            
-            # 获取水印文本和设置，确保安全处理
-            text = settings.get('text', '')
-            # 确保文本是安全的字符串，防止编码问题
-            try:
-                safe_text = str(text) if text else ''
-                print(f"水印文本: {repr(safe_text)}")
-                # 验证文本是否能被正确编码
-                test_encode = safe_text.encode('utf-8').decode('utf-8')
-                print(f"文本UTF-8验证成功")
-            except Exception as e:
-                print(f"文本处理失败: {type(e).__name__}: {e}")
-                # 使用安全的默认文本
-                safe_text = "Watermark"
-                print(f"使用默认文本: {safe_text}")
-            
-            # 获取字体大小并根据预览窗口比例调整，确保与导出结果一致
-            base_font_size = settings.get('size', 30)
-            
-            # 计算预览窗口与实际图片的比例关系，调整字体大小以保持视觉一致性
-            try:
-                # 获取原始图片尺寸
-                orig_width, orig_height = image.size
-                # 预览窗口固定大小
-                preview_width, preview_height = 350, 250
-                
-                # 计算缩放比例
-                scale_factor = min(preview_width / orig_width, preview_height / orig_height)
-                # 根据比例调整字体大小
-                font_size = int(base_font_size * scale_factor)
-                # 确保字体大小至少可读
-                font_size = max(5, font_size)
-                print(f"调整字体大小: 原始={base_font_size}, 比例={scale_factor:.2f}, 调整后={font_size}")
-            except Exception as e:
-                print(f"计算字体缩放比例失败: {e}，使用原始大小")
-                font_size = base_font_size
-            
-            # 获取所有文本效果相关的设置
-            opacity = int(settings.get('opacity', 0.5) * 255)  # 转换为0-255范围
-            rotation = settings.get('rotation', 0)
-            color_str = settings.get('color', '#FFFFFF')
-            style = settings.get('style', 'single')
-            spacing = settings.get('spacing', 20)
-            
-            # 新增：获取字体样式和效果设置
-            bold = settings.get('bold', False)
-            italic = settings.get('italic', False)
-            shadow = settings.get('shadow', False)
-            stroke = settings.get('stroke', False)
-            stroke_width = settings.get('stroke_width', 2)
-            stroke_color_str = settings.get('stroke_color', '#000000')
-            
-            print(f"水印设置: 字体大小={font_size}, 不透明度={opacity}, 旋转={rotation}, 样式={style}")
-            print(f"文本效果设置: 粗体={bold}, 斜体={italic}, 阴影={shadow}, 描边={stroke}, 描边宽度={stroke_width}")
-            
-            # 将十六进制颜色转换为RGBA元组，添加更详细的错误处理和调试
-            print("===== 颜色处理开始 =====")
-            print(f"输入颜色值: {color_str}, 不透明度: {opacity}")
-            try:
-                # 移除#号（如果有）
-                color_str = str(color_str).lstrip('#')
-                print(f"处理后的颜色字符串: {color_str}")
-                # 确保颜色字符串长度正确
-                if len(color_str) != 6:
-                    raise ValueError(f"颜色字符串长度不正确: {color_str}")
-                # 转换为RGB
-                r = int(color_str[0:2], 16)
-                g = int(color_str[2:4], 16)
-                b = int(color_str[4:6], 16)
-                print(f"RGB值: R={r}, G={g}, B={b}")
-                # 确保值在有效范围内
-                if not (0 <= r <= 255 and 0 <= g <= 255 and 0 <= b <= 255):
-                    raise ValueError(f"颜色值超出范围: R={r}, G={g}, B={b}")
-                # 创建RGBA颜色
-                color = (r, g, b, opacity)
-                print(f"===== 颜色转换成功: {color} =====")
-            except Exception as e:
-                print(f"===== 颜色转换失败: {type(e).__name__}: {e} =====")
-                # 默认使用白色半透明
-                color = (255, 255, 255, 128)
-                print(f"使用默认颜色: {color}")
-            
-            # 解析描边颜色
-            try:
-                stroke_color_str = str(stroke_color_str).lstrip('#')
-                # 确保颜色字符串长度正确
-                if len(stroke_color_str) != 6:
-                    raise ValueError(f"描边颜色字符串长度不正确: {stroke_color_str}")
-                sr = int(stroke_color_str[0:2], 16)
-                sg = int(stroke_color_str[2:4], 16)
-                sb = int(stroke_color_str[4:6], 16)
-                # 确保值在有效范围内
-                if not (0 <= sr <= 255 and 0 <= sg <= 255 and 0 <= sb <= 255):
-                    raise ValueError(f"描边颜色值超出范围: R={sr}, G={sg}, B={sb}")
-                stroke_color = (sr, sg, sb, 255)  # 描边通常使用完全不透明
-                print(f"描边颜色转换成功: {stroke_color}")
-            except Exception as e:
-                print(f"描边颜色转换错误: {type(e).__name__}: {e}")
-                stroke_color = (0, 0, 0, 255)  # 默认黑色描边
-            
-            # 尝试加载字体，如果失败使用默认字体
-            font = None
-            font_options = []
-            
-            # 根据bold和italic属性构建字体选项列表
-            if bold and italic:
-                # 粗斜体
-                font_options = [f"{settings.get('font', 'Arial')}:bold:italic", f"{settings.get('font', 'Arial')}-BoldItalic"]
-            elif bold:
-                # 粗体
-                font_options = [f"{settings.get('font', 'Arial')}:bold", f"{settings.get('font', 'Arial')}-Bold"]
-            elif italic:
-                # 斜体
-                font_options = [f"{settings.get('font', 'Arial')}:italic", f"{settings.get('font', 'Arial')}-Italic"]
-            
-            # 添加基本字体作为后备选项
-            font_names = font_options + [settings.get('font', '微软雅黑'), 'Microsoft YaHei', 'SimHei', 'Arial']
-            font_paths = ['C:/Windows/Fonts/msyh.ttf', 'C:/Windows/Fonts/simhei.ttf']  # Windows常见中文字体路径，优先微软雅黑
-            
-            # 先尝试字体路径
-            for font_path in font_paths:
-                try:
-                    if os.path.exists(font_path):
-                        font = ImageFont.truetype(font_path, font_size)
-                        print(f"成功加载字体文件: {font_path}")
-                        break
-                except Exception as e:
-                    print(f"加载字体文件失败 {font_path}: {type(e).__name__}: {e}")
-            
-            # 如果没有找到字体文件，尝试字体名称
-            if font is None:
-                for font_name in font_names:
-                    try:
-                        print(f"尝试加载字体: {font_name}")
-                        # 尝试直接加载字体名称
-                        font = ImageFont.truetype(font_name, font_size)
-                        print(f"成功加载字体名称: {font_name}")
-                        # 测试是否能正确渲染文本
-                        try:
-                            temp_img = Image.new('RGBA', (100, 100), (255, 255, 255, 0))
-                            temp_draw = ImageDraw.Draw(temp_img)
-                            test_char = safe_text[:1] if safe_text else 'A'
-                            temp_draw.text((0, 0), test_char, font=font, fill=color)
-                            print(f"字体渲染测试成功")
-                            break
-                        except Exception as render_e:
-                            print(f"字体渲染测试失败: {type(render_e).__name__}: {render_e}")
-                            font = None
-                            continue
-                    except Exception as e:
-                        print(f"加载字体名称失败 {font_name}: {type(e).__name__}: {e}")
-                        # 尝试添加.ttf后缀
-                        try:
-                            ttf_name = f"{font_name}.ttf"
-                            font = ImageFont.truetype(ttf_name, font_size)
-                            print(f"成功加载字体文件: {ttf_name}")
-                            break
-                        except Exception as e2:
-                            print(f"加载ttf字体失败 {ttf_name}: {type(e2).__name__}: {e2}")
-            # 如果所有字体都加载失败，使用默认字体
-            if font is None:
-                try:
-                    font = ImageFont.load_default()
-                    print("使用默认字体")
-                except Exception as e:
-                    print(f"加载默认字体失败: {type(e).__name__}: {e}")
-                    font = None  # 允许font为None，让绘制函数处理
-            
-            watermark_rect = None
-            # 根据不同的水印样式应用
-            try:
-                if style == "single":
-                    # 单个水印
-                    print("应用单个水印")
-                    watermark_rect = self._apply_single_watermark(draw, watermarked.size, safe_text, font, color, opacity, 
-                                                settings.get('h_position', 0.5), settings.get('v_position', 0.5), rotation,
-                                                shadow=shadow, stroke=stroke, stroke_width=stroke_width, stroke_color=stroke_color)
-                else:
-                    print(f"使用单个水印")
-                    watermark_rect = self._apply_single_watermark(draw, watermarked.size, safe_text, font, color, opacity, 
-                                                settings.get('h_position', 0.5), settings.get('v_position', 0.5), rotation,
-                                                shadow=shadow, stroke=stroke, stroke_width=stroke_width, stroke_color=stroke_color)
-            except Exception as e:
-                print(f"应用水印样式失败: {type(e).__name__}: {e}")
-                traceback.print_exc()
-                # 尝试最简单的备用方案：在图片角落添加文本
-                try:
-                    print("尝试备用水印方案")
-                    if font:
-                        draw.text((10, 10), safe_text, font=font, fill=color)
-                    else:
-                        draw.text((10, 10), safe_text, fill=color)
-                    print("备用水印方案应用成功")
-                    # 备用水印位置在左上角
-                    watermark_rect = (10, 10, 100, 30)  # 估算的大小
-                except Exception as e2:
-                    print(f"备用水印方案也失败: {type(e2).__name__}: {e2}")
-            
-            print("=== 水印应用完成(预览) ===")
-            return watermarked, watermark_rect
-        except Exception as e:
-            print(f"整个水印应用过程失败: {type(e).__name__}: {e}")
-            traceback.print_exc()
-            # 如果整个过程失败，返回原始图像的副本和None位置
-            return image.copy(), None
-    
-    def _draw_text_with_effects(self, draw, position, text, font, fill, shadow=False, stroke=False, stroke_width=2, stroke_fill=(0,0,0,255)):
-        """
-        绘制带有效果的文本
-        
-        Args:
-            draw: ImageDraw对象
-            position: 文本位置 (x, y)
-            text: 要绘制的文本
-            font: ImageFont对象
-            fill: 文本颜色 (RGBA元组)
-            shadow: 是否添加阴影
-            stroke: 是否添加描边
-            stroke_width: 描边宽度
-            stroke_fill: 描边颜色 (RGBA元组)
-        """
-        x, y = position
-        
-        print("===== 文本绘制开始 =====")
-        print(f"绘制文本: 位置={position}, 文本={repr(text)}, 颜色={fill}, 阴影={shadow}, 描边={stroke}, 描边颜色={stroke_fill}")
-        
-        # 验证颜色参数格式
-        if not isinstance(fill, (tuple, list)) or len(fill) != 4:
-            print(f"警告: 颜色格式不正确: {fill}，使用默认颜色")
-            fill = (255, 255, 255, 255)
-        
-        if not isinstance(stroke_fill, (tuple, list)) or len(stroke_fill) != 4:
-            print(f"警告: 描边颜色格式不正确: {stroke_fill}，使用默认描边颜色")
-            stroke_fill = (0, 0, 0, 255)
-        
-        # 绘制阴影
-        if shadow:
-            shadow_color = (0, 0, 0, int(fill[3] * 0.5))  # 半透明黑色阴影
-            print(f"绘制阴影: 颜色={shadow_color}, 偏移=(+2,+2)")
-            # 绘制阴影（右下方偏移）
-            draw.text((x + 2, y + 2), text, font=font, fill=shadow_color)
-        
-        # 绘制描边 - 使用更有效的方法
-        if stroke:
-            print(f"绘制描边: 宽度={stroke_width}, 颜色={stroke_fill}")
-            # 对于较新版本的PIL，可以使用stroke_width参数
-            try:
-                # 尝试使用PIL的描边功能（如果可用）
-                draw.text((x, y), text, font=font, fill=fill, stroke_width=stroke_width, stroke_fill=stroke_fill)
-                print("使用PIL内置描边功能，同时绘制了文本和描边")
-                return  # 已经绘制了文本和描边，直接返回
-            except TypeError:
-                # 如果stroke_width参数不可用，使用传统方法
-                print("使用传统描边方法")
-                # 简化的描边实现，只绘制必要的像素
-                for offset in range(1, stroke_width + 1):
-                    # 四个主要方向
-                    draw.text((x - offset, y), text, font=font, fill=stroke_fill)
-                    draw.text((x + offset, y), text, font=font, fill=stroke_fill)
-                    draw.text((x, y - offset), text, font=font, fill=stroke_fill)
-                    draw.text((x, y + offset), text, font=font, fill=stroke_fill)
-        
-        # 绘制主文本 - 确保直接使用传入的颜色
-        print(f"绘制主文本: 颜色={fill}")
-        # 为了确保颜色正确应用，我们直接使用传入的颜色值，不做任何修改
-        draw.text((x, y), text, font=font, fill=fill)
-        print(f"主文本绘制完成，颜色={fill}已应用")
-        
-    def _apply_single_watermark(self, draw, image_size, text, font, color, opacity, h_position, v_position, rotation, shadow=False, stroke=False, stroke_width=2, stroke_color=(0,0,0,255)):
-        """
-        应用单个水印
-        
-        Returns:
-            tuple: (x, y, width, height) - 水印位置和尺寸
-        """
-        from PIL import Image, ImageDraw, ImageFont
-        import traceback
-        
-        # 创建临时图像来绘制文字
-        temp_img = Image.new('RGBA', image_size, (255, 255, 255, 0))
-        temp_draw = ImageDraw.Draw(temp_img)
-        
-        # 确保文本是安全的字符串
-        safe_text = str(text) if text else ''
-        print(f"应用水印文本: {repr(safe_text)}, 位置: ({h_position}, {v_position}), 旋转: {rotation}")
-        print(f"应用文本效果: 阴影={shadow}, 描边={stroke}, 描边宽度={stroke_width}")
-        
-        # 获取文本尺寸
-        text_width, text_height = 100, 30  # 默认大小
-        try:
-            # 优先使用textbbox，这是较新版本PIL推荐的方式
-            # 安全地计算文本边界框
-            try:
-                bbox = temp_draw.textbbox((0, 0), safe_text, font=font)
-                text_width = bbox[2] - bbox[0]
-                text_height = bbox[3] - bbox[1]
-                print(f"文本尺寸计算成功: {text_width}x{text_height}")
-            except Exception as e:
-                print(f"文本边界框计算失败: {type(e).__name__}: {e}")
-                # 如果失败，尝试使用textsize（旧版本PIL）
-                try:
-                    text_width, text_height = temp_draw.textsize(safe_text, font=font)
-                    print(f"使用textsize计算成功: {text_width}x{text_height}")
-                except Exception as e2:
-                    print(f"文本尺寸计算失败，使用默认值: {type(e2).__name__}: {e2}")
-        except Exception as e:
-            print(f"获取文本尺寸出错: {type(e).__name__}: {e}")
-        
-        # 计算水印位置
-        x = max(0, int((image_size[0] - text_width) * h_position))
-        y = max(0, int((image_size[1] - text_height) * v_position))
-        print(f"计算水印位置: ({x}, {y})")
-        
-        final_x, final_y, final_width, final_height = x, y, text_width, text_height
-        
-        # 如果需要旋转
-        if rotation != 0:
-            try:
-                # 创建足够大的文本图像以容纳旋转后的文本
-                max_dim = max(text_width, text_height)
-                padding = 20
-                text_img = Image.new('RGBA', (max_dim + padding, max_dim + padding), (255, 255, 255, 0))
-                text_draw = ImageDraw.Draw(text_img)
-                
-                # 绘制文本到中心位置
-                center_x = (text_img.width - text_width) // 2
-                center_y = (text_img.height - text_height) // 2
-                print(f"绘制旋转文本到临时图像中心: ({center_x}, {center_y})")
-                
-                # 使用_draw_text_with_effects方法绘制带效果的文本
-                try:
-                    self._draw_text_with_effects(text_draw, (center_x, center_y), safe_text, font, color, 
-                                               shadow=shadow, stroke=stroke, stroke_width=stroke_width, 
-                                               stroke_fill=stroke_color)
-                except Exception as e:
-                    print(f"绘制旋转文本失败: {type(e).__name__}: {e}")
-                    # 降级方案：尝试不带字体绘制
-                    try:
-                        text_draw.text((center_x, center_y), safe_text, fill=color)
-                        print("降级到无字体绘制成功")
-                    except Exception as e2:
-                        print(f"无字体绘制也失败: {type(e2).__name__}: {e2}")
-                
-                # 旋转文本图像
-                rotated = text_img.rotate(rotation, expand=True)
-                
-                # 计算旋转后的位置
-                rot_x = x - (rotated.width - text_width) // 2
-                rot_y = y - (rotated.height - text_height) // 2
-                
-                # 确保位置有效
-                rot_x = max(0, rot_x)
-                rot_y = max(0, rot_y)
-                print(f"旋转后位置: ({rot_x}, {rot_y})")
-                
-                # 粘贴旋转后的文本
-                temp_img.paste(rotated, (rot_x, rot_y), rotated)
-                
-                # 更新最终位置和尺寸为旋转后的
-                final_x, final_y, final_width, final_height = rot_x, rot_y, rotated.width, rotated.height
-            except Exception as e:
-                print(f"旋转水印处理失败: {type(e).__name__}: {e}")
-                traceback.print_exc()
-                # 降级到不旋转直接绘制
-                try:
-                    print(f"降级到不旋转绘制，应用文本效果")
-                    self._draw_text_with_effects(temp_draw, (x, y), safe_text, font, color, 
-                                               shadow=shadow, stroke=stroke, stroke_width=stroke_width, 
-                                               stroke_fill=stroke_color)
-                    print("降级到不旋转绘制成功")
-                except Exception as e2:
-                    print(f"降级绘制失败: {type(e2).__name__}: {e2}")
-        else:
-            # 直接绘制文本，使用_draw_text_with_effects方法
-            try:
-                print(f"直接绘制文本到位置: ({x}, {y})，应用文本效果")
-                self._draw_text_with_effects(temp_draw, (x, y), safe_text, font, color, 
-                                           shadow=shadow, stroke=stroke, stroke_width=stroke_width, 
-                                           stroke_fill=stroke_color)
-            except Exception as e:
-                print(f"直接绘制文本失败: {type(e).__name__}: {e}")
-                # 降级方案：尝试不带字体绘制
-                try:
-                    temp_draw.text((x, y), safe_text, fill=color)
-                    print("降级到无字体绘制成功")
-                except Exception as e2:
-                    print(f"无字体绘制也失败: {type(e2).__name__}: {e2}")
-        
-        # 将临时图像合并到原图
-        try:
-            draw.bitmap((0, 0), temp_img, fill=None)
-        except Exception as e:
-            print(f"bitmap方法失败: {type(e).__name__}: {e}")
-            # 如果bitmap方法失败，尝试其他方法
-            try:
-                draw.bitmap((0, 0), temp_img)
-                print("降级bitmap方法成功")
-            except Exception as e2:
-                print(f"降级bitmap方法也失败: {type(e2).__name__}: {e2}")
-        
-        # 返回水印的位置和尺寸
-        return (final_x, final_y, final_width, final_height)
-    
-    def _apply_tile_watermark(self, draw, image_size, text, font, color, opacity, spacing, rotation, 
-                             shadow=False, stroke=False, stroke_width=2, stroke_color=(0,0,0,255)):
-        # 水印方法已简化，只使用单个水印功能
-        pass
-
     def _is_point_in_watermark(self, pos):
         """
         判断给定位置是否在水印区域内
@@ -1334,9 +819,8 @@ class PreviewPanel(QWidget):
                     default_width = estimated_width
                     default_height = estimated_height
                     
-                    print(f"DEBUG: 计算的默认水印矩形区域: ({default_x}, {default_y}, {default_width}, {default_height})")
                 except Exception as e:
-                    print(f"DEBUG: 计算默认水印矩形区域失败，使用降级方案: {e}")
+                    logger.debug("计算默认水印矩形区域失败，使用降级方案: %s", e)
                     # 降级到简单计算
                     window_width = self.effect_preview.width()
                     window_height = self.effect_preview.height()
@@ -1374,7 +858,6 @@ class PreviewPanel(QWidget):
                 mouse_x, mouse_y = pos.x(), pos.y()
                 is_in_default = (default_x <= mouse_x <= default_x + default_width) and \
                                (default_y <= mouse_y <= default_y + default_height)
-                print(f"DEBUG: 鼠标位置({mouse_x}, {mouse_y})是否在默认水印区域({default_x}, {default_y}, {default_width}, {default_height})内: {is_in_default}")
                 return is_in_default
             return False
         
@@ -1385,11 +868,9 @@ class PreviewPanel(QWidget):
             
             # 计算是否在矩形范围内
             is_in_rect = (x <= mouse_x <= x + width) and (y <= mouse_y <= y + height)
-            print(f"DEBUG: 鼠标位置({mouse_x}, {mouse_y})是否在水印区域({x}, {y}, {width}, {height})内: {is_in_rect}")
             return is_in_rect
         except Exception as e:
-            print(f"DEBUG: 判断鼠标是否在水印区域内时出错: {e}")
-            traceback.print_exc()
+            logger.exception("判断鼠标是否在水印区域内时出错: %s", e)
             # 出错时，使用与水印矩形不存在时相同的默认行为
             if hasattr(self, 'effect_preview') and self.effect_preview:
                 window_width = self.effect_preview.width()
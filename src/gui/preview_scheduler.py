@@ -0,0 +1,185 @@
+# src/gui/preview_scheduler.py
+import os
+import tempfile
+from typing import Any, NamedTuple, Optional, Tuple
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from src.core.image_cache import IMAGE_CACHE
+from src.core.watermark_renderer import WatermarkRenderer
+from src.gui.qt_image import pil_to_qimage
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 合并连续请求的时间窗口（毫秒），约为一帧
+COALESCE_DELAY_MS = 16
+# 设置该环境变量（非空且不为0）后，每次预览渲染结果都会保存到临时目录中便于调试
+DEBUG_DUMP_ENV = 'PHOTO_WATERMARK_DEBUG_DUMP'
+DEBUG_DUMP_FILENAME = 'debug_watermarked.png'
+
+
+def get_debug_dump_dir():
+    """
+    获取预览调试图片的保存目录
+
+    Returns:
+        Optional[str]: 保存目录，未开启调试保存时返回None
+    """
+    value = os.environ.get(DEBUG_DUMP_ENV, '').strip()
+    if not value or value == '0':
+        return None
+    return os.path.join(tempfile.gettempdir(), 'photo_watermark_debug')
+
+
+def _dump_debug_image(image, dump_dir):
+    """在渲染线程中保存调试图片，先写临时文件再替换，避免读到写了一半的文件"""
+    try:
+        os.makedirs(dump_dir, exist_ok=True)
+        path = os.path.join(dump_dir, DEBUG_DUMP_FILENAME)
+        tmp_path = path + '.tmp'
+        # 调试用途，使用最低压缩级别以减少编码时间
+        image.save(tmp_path, 'PNG', compress_level=1)
+        os.replace(tmp_path, path)
+        logger.debug("调试图片已保存到: %s", path)
+    except Exception as e:
+        logger.warning("保存调试图片失败: %s", e)
+
+
+class PreviewResult(NamedTuple):
+    """一次后台预览渲染的结果"""
+    generation: int
+    image_path: str
+    settings: dict
+    # 预览代理图像与带水印的代理图像（PIL）
+    proxy: Any
+    watermarked: Any
+    # 转换好的QImage，GUI线程只需转为QPixmap
+    q_image: Any
+    # 水印在代理图像中的矩形 (x, y, width, height)
+    watermark_rect: Optional[Tuple[int, int, int, int]]
+    # 按代理图比例编译的渲染计划与水印图层，拖拽水印时直接复用
+    plan: Any
+    stamp: Any
+    error: Optional[str] = None
+
+
+class _PreviewSignals(QObject):
+    """渲染完成信号，工作线程发出，GUI线程接收"""
+    finished = pyqtSignal(object)
+
+
+class _PreviewTask(QRunnable):
+    """在后台线程中渲染预览：取代理图、添加水印、转换为QImage"""
+
+    def __init__(self, generation, image_path, settings, proxy_size, signals, dump_dir=None):
+        super().__init__()
+        self.generation = generation
+        self.image_path = image_path
+        self.settings = settings
+        self.proxy_size = proxy_size
+        self.signals = signals
+        self.dump_dir = dump_dir
+
+    def run(self):
+        proxy = watermarked = q_image = watermark_rect = plan = stamp = None
+        error = None
+        try:
+            loaded = IMAGE_CACHE.load_proxy(self.image_path, self.proxy_size)
+            if loaded is None:
+                raise IOError(f"无法加载图片: {self.image_path}")
+            proxy, original_size = loaded
+            # 按代理图与原图的比例缩放字号、描边等尺寸，效果与导出一致
+            scale = proxy.width / original_size[0] if original_size[0] else 1.0
+            renderer = WatermarkRenderer(self.settings, scale)
+            watermarked = renderer.render(proxy)
+            watermark_rect = renderer.get_watermark_rect(proxy.size)
+            plan, stamp = renderer.plan, renderer.stamp
+            q_image = pil_to_qimage(watermarked)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            logger.exception("渲染预览失败: %s", self.image_path)
+        self.signals.finished.emit(PreviewResult(
+            self.generation, self.image_path, self.settings,
+            proxy, watermarked, q_image, watermark_rect, plan, stamp, error))
+        # 结果发出后再写调试图片，不推迟预览显示
+        if self.dump_dir and watermarked is not None:
+            _dump_debug_image(watermarked, self.dump_dir)
+
+
+class PreviewScheduler(QObject):
+    """
+    预览渲染调度器
+
+    同一帧内的多次请求合并为一次；渲染在单独的线程中进行，
+    渲染期间到达的请求只保留最新的一个，过期的结果直接丢弃。
+    """
+    # 最新一次请求的渲染结果(PreviewResult)
+    preview_ready = pyqtSignal(object)
+
+    def __init__(self, proxy_size, parent=None):
+        """
+        Args:
+            proxy_size: 预览代理图像的最大尺寸 (width, height)
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.proxy_size = tuple(proxy_size)
+        self._generation = 0
+        # 等待渲染的最新请求 (generation, image_path, settings)
+        self._pending = None
+        self._busy = False
+        # 调试保存默认关闭，正常预览不产生任何磁盘写入
+        self.debug_dump_dir = get_debug_dump_dir()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._start_render)
+
+        # 单线程即可：同一时间只需要渲染最新的设置
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._signals = _PreviewSignals(self)
+        self._signals.finished.connect(self._on_render_finished)
+
+    def request(self, image_path, settings):
+        """
+        请求渲染预览，立即返回
+
+        Args:
+            image_path: 图片路径
+            settings: 水印设置
+        """
+        self._generation += 1
+        self._pending = (self._generation, str(image_path), dict(settings))
+        # 不重新计时：连续拖动滑块时每帧仍能渲染一次
+        if not self._timer.isActive():
+            self._timer.start(COALESCE_DELAY_MS)
+
+    def cancel(self):
+        """丢弃尚未完成的请求与结果"""
+        self._generation += 1
+        self._pending = None
+        self._timer.stop()
+
+    def wait(self, msecs=-1):
+        """等待正在进行的渲染结束（关闭程序时使用）"""
+        return self._pool.waitForDone(msecs)
+
+    def _start_render(self):
+        """开始渲染最新的请求；正在渲染时等待其结束后再开始"""
+        if self._busy or self._pending is None:
+            return
+        generation, image_path, settings = self._pending
+        self._pending = None
+        self._busy = True
+        self._pool.start(_PreviewTask(generation, image_path, settings, self.proxy_size,
+                                      self._signals, self.debug_dump_dir))
+
+    def _on_render_finished(self, result):
+        """渲染结束：只发出最新请求的结果，并继续处理期间到达的请求"""
+        self._busy = False
+        if result.generation == self._generation:
+            self.preview_ready.emit(result)
+        if self._pending is not None and not self._timer.isActive():
+            self._start_render()
@@ -0,0 +1,60 @@
+# src/gui/qt_image.py
+from PyQt5.QtGui import QImage, QPixmap
+
+
+# PIL模式 -> (导出的raw模式, 每像素字节数, QImage格式)
+# 均为与字节序无关的逐字节布局，PIL打包一次即可直接被QImage引用
+QIMAGE_LAYOUTS = {
+    'RGB': ('RGBX', 4, QImage.Format_RGBX8888),
+    'RGBX': ('RGBX', 4, QImage.Format_RGBX8888),
+    'RGBA': ('RGBA', 4, QImage.Format_RGBA8888),
+    'L': ('L', 1, QImage.Format_Grayscale8),
+}
+
+
+def _normalize_mode(image):
+    """将QImage无法直接表示的模式转换为RGB或RGBA，其余模式原样返回"""
+    if image.mode in QIMAGE_LAYOUTS:
+        return image
+    if image.mode in ('LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info):
+        return image.convert('RGBA')
+    return image.convert('RGB')
+
+
+def pil_to_qimage(image):
+    """
+    将PIL图像转换为QImage，QImage直接引用打包后的像素缓冲区，不再额外复制
+
+    缓冲区保存在返回对象的_buffer属性上，随QImage对象一起释放，
+    因此可以在工作线程中调用，并作为Python对象通过信号传递。
+    需要在C++侧长期保存时（例如以QImage类型排队传递）应先调用copy()。
+
+    Args:
+        image: PIL图像（RGB、RGBA、L直接打包，其他模式先转换为RGB或RGBA）
+
+    Returns:
+        QImage: 转换后的图像
+    """
+    image = _normalize_mode(image)
+    rawmode, channels, q_format = QIMAGE_LAYOUTS[image.mode]
+    width, height = image.size
+    # PIL不公开内部的行缓冲区，tobytes是唯一一次复制（RGB补齐为RGBX时同时完成）
+    data = image.tobytes('raw', rawmode)
+    q_image = QImage(data, width, height, channels * width, q_format)
+    # QImage只引用data的内存，必须保证data与QImage同生命周期
+    q_image._buffer = data
+    return q_image
+
+
+def pil_to_qpixmap(image):
+    """
+    将PIL图像转换为QPixmap（只能在GUI线程中调用）
+
+    Args:
+        image: PIL图像（任意模式，处理方式同pil_to_qimage）
+
+    Returns:
+        QPixmap: 转换后的位图
+    """
+    # fromImage会复制像素数据，临时的QImage与缓冲区随后即可释放
+    return QPixmap.fromImage(pil_to_qimage(image))
@@ -1,11 +1,16 @@
 # src/gui/settings_panel.py
+import os
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
                              QComboBox, QSlider, QPushButton, QColorDialog, QFrame,
-                             QRadioButton, QGroupBox, QGridLayout, QMessageBox, QScrollArea)
+                             QRadioButton, QGroupBox, QGridLayout, QMessageBox, QScrollArea,
+                             QFileDialog)
 from PyQt5.QtGui import QColor
 from PyQt5.QtCore import Qt
-from PIL import Image, ImageDraw, ImageFont
 from ..core.template_manager import TemplateManager
+from ..core.watermark_renderer import WatermarkRenderer
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class SettingsPanel(QWidget):
     """
@@ -193,6 +198,18 @@ class SettingsPanel(QWidget):
             elif hasattr(self, 'watermark_text'):
                 self.watermark_text.setText(settings['text'])
         
+        # 应用水印类型与图片设置
+        if 'image_path' in settings and hasattr(self, 'image_path_label'):
+            self._set_watermark_image(settings['image_path'])
+        if 'image_scale' in settings and hasattr(self, 'image_scale_slider'):
+            self.image_scale_slider.setValue(int(settings['image_scale']))
+            self.image_scale_value.setText(f"{int(settings['image_scale'])}%")
+        if 'type' in settings and hasattr(self, 'image_type_radio'):
+            if settings['type'] == 'image':
+                self.image_type_radio.setChecked(True)
+            else:
+                self.text_type_radio.setChecked(True)
+        
         # 应用字体设置 - 适配不同的属性名
         if hasattr(self, 'font_combo'):
             font_key = 'font_family' if 'font_family' in settings else 'font'
@@ -281,6 +298,7 @@ class SettingsPanel(QWidget):
         
         if 'spacing' in settings and hasattr(self, 'spacing_slider'):
             self.spacing_slider.setValue(settings['spacing'])
+            self.spacing_value.setText(f"{settings['spacing']}px")
         
         # 应用输出设置
         if 'format' in settings and hasattr(self, 'format_combo'):
@@ -311,6 +329,43 @@ class SettingsPanel(QWidget):
         text_layout.addWidget(self.watermark_text)
         group_layout.addLayout(text_layout)
         
+        # 水印类型：文本或图片（如PNG格式的Logo）
+        type_layout = QHBoxLayout()
+        type_label = QLabel("水印类型")
+        self.text_type_radio = QRadioButton("文本")
+        self.image_type_radio = QRadioButton("图片")
+        self.text_type_radio.setChecked(True)
+        self.image_type_radio.toggled.connect(self._on_position_change)
+        type_layout.addWidget(type_label)
+        type_layout.addWidget(self.text_type_radio)
+        type_layout.addWidget(self.image_type_radio)
+        group_layout.addLayout(type_layout)
+        
+        # 水印图片选择
+        image_layout = QHBoxLayout()
+        self.image_path_label = QLabel("未选择图片")
+        self.image_path_label.setStyleSheet("color: #666666;")
+        self.image_path = ''
+        image_button = QPushButton("选择图片")
+        image_button.clicked.connect(self.select_watermark_image)
+        image_layout.addWidget(self.image_path_label, 2)
+        image_layout.addWidget(image_button, 1)
+        group_layout.addLayout(image_layout)
+        
+        # 图片缩放比例（相对于原图尺寸）
+        image_scale_layout = QHBoxLayout()
+        image_scale_label = QLabel("图片缩放")
+        self.image_scale_slider = QSlider(Qt.Horizontal)
+        self.image_scale_slider.setRange(10, 300)
+        self.image_scale_slider.setValue(100)
+        self.image_scale_value = QLabel("100%")
+        self.image_scale_slider.valueChanged.connect(lambda value: self.image_scale_value.setText(f"{value}%"))
+        self.image_scale_slider.valueChanged.connect(self._on_position_change)
+        image_scale_layout.addWidget(image_scale_label, 1)
+        image_scale_layout.addWidget(self.image_scale_slider, 2)
+        image_scale_layout.addWidget(self.image_scale_value, 1)
+        group_layout.addLayout(image_scale_layout)
+        
         group_box.setLayout(group_layout)
         layout.addWidget(group_box)
     
@@ -460,6 +515,37 @@ class SettingsPanel(QWidget):
     
     def _add_style_settings(self, layout):
         """添加水印样式相关设置"""
+        # 样式设置：单个水印或在整张图片上重复
+        style_group = QGroupBox("水印样式")
+        style_group_layout = QVBoxLayout()
+        
+        style_layout = QHBoxLayout()
+        self.single_radio = QRadioButton("单个")
+        self.tile_radio = QRadioButton("平铺")
+        self.diagonal_radio = QRadioButton("错位平铺")
+        self.single_radio.setChecked(True)
+        for radio in (self.single_radio, self.tile_radio, self.diagonal_radio):
+            radio.toggled.connect(self._on_position_change)
+            style_layout.addWidget(radio)
+        style_group_layout.addLayout(style_layout)
+        
+        # 平铺间距（原图像素）
+        spacing_layout = QHBoxLayout()
+        spacing_label = QLabel("平铺间距")
+        self.spacing_slider = QSlider(Qt.Horizontal)
+        self.spacing_slider.setRange(0, 300)
+        self.spacing_slider.setValue(50)
+        self.spacing_value = QLabel("50px")
+        self.spacing_slider.valueChanged.connect(lambda value: self.spacing_value.setText(f"{value}px"))
+        self.spacing_slider.valueChanged.connect(self._on_position_change)
+        spacing_layout.addWidget(spacing_label, 1)
+        spacing_layout.addWidget(self.spacing_slider, 2)
+        spacing_layout.addWidget(self.spacing_value, 1)
+        style_group_layout.addLayout(spacing_layout)
+        
+        style_group.setLayout(style_group_layout)
+        layout.addWidget(style_group)
+        
         # 位置设置
         position_group = QGroupBox("水印位置设置")
         position_group_layout = QVBoxLayout()
@@ -537,16 +623,29 @@ class SettingsPanel(QWidget):
         current_color = QColor(self.color_value.text()) if self.color_value.text() else Qt.white
         color = QColorDialog.getColor(current_color, self, "选择水印颜色")
         if color.isValid():
-            print(f"DEBUG: 选择了新颜色: {color.name()}")
+            logger.debug("选择了新颜色: %s", color.name())
             self.color_button.setStyleSheet(f"background-color: {color.name()}; border: 1px solid #CCCCCC;")
             self.color_value.setText(color.name())
-            # 立即获取设置并打印
-            settings = self._get_current_settings()
-            print(f"DEBUG: 选择颜色后设置: {settings}")
             # 触发预览更新
-            print(f"DEBUG: 触发预览更新")
             self._on_position_change()
     
+    def select_watermark_image(self):
+        """选择水印图片，并切换到图片水印"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "选择水印图片", os.path.dirname(self.image_path) if self.image_path else "",
+            "PNG图片 (*.png);;所有图片 (*.png *.jpg *.jpeg *.bmp *.tif *.tiff)")
+        if file_path:
+            self._set_watermark_image(file_path)
+            self.image_type_radio.setChecked(True)
+            # 触发预览更新
+            self._on_position_change()
+    
+    def _set_watermark_image(self, file_path):
+        """记录水印图片路径并更新显示"""
+        self.image_path = file_path or ''
+        self.image_path_label.setText(os.path.basename(self.image_path) if self.image_path else "未选择图片")
+        self.image_path_label.setToolTip(self.image_path)
+    
     def select_stroke_color(self):
         """选择描边颜色"""
         current_color = QColor(self.stroke_color_value.text()) if self.stroke_color_value.text() else Qt.black
@@ -558,392 +657,17 @@ class SettingsPanel(QWidget):
             self._on_position_change()
     
     def apply_watermark(self, image, settings):
-        """应用水印到图片上"""
-        from PIL import Image, ImageDraw, ImageFont
-        import os
-        import sys
-        import logging
-        
-        # 创建图像副本，并确保是RGBA模式以支持透明度
-        if image.mode != 'RGBA':
-            watermarked = image.convert('RGBA')
-        else:
-            watermarked = image.copy()
-        
-        draw = ImageDraw.Draw(watermarked)
-        
-        # 获取水印文本和设置
-        text = settings.get('text', '')
-        font_size = settings.get('size', 30)
-        opacity = int(settings.get('opacity', 0.5) * 255)  # 转换为0-255范围
-        color_str = settings.get('color', '#FFFFFF')
-        font_name = settings.get('font', '微软雅黑')  # 默认使用中文字体
-        bold = settings.get('bold', False)
-        italic = settings.get('italic', False)
-        shadow = settings.get('shadow', False)
-        stroke = settings.get('stroke', False)
-        stroke_width = settings.get('stroke_width', 2)
-        stroke_color_str = settings.get('stroke_color', '#000000')
-        rotation = settings.get('rotation', 0)
-        
-        print(f"应用水印设置: 文本='{text}', 字体='{font_name}', 大小={font_size}, 颜色={color_str}, 描边={stroke}, 阴影={shadow}")
-        
-        # 确保文本是安全的字符串
-        try:
-            safe_text = str(text) if text else ''
-            # 确保是UTF-8编码的字符串
-            safe_text = safe_text.encode('utf-8', 'surrogateescape').decode('utf-8', 'surrogateescape')
-            print(f"安全处理后的文本: {repr(safe_text)}")
-        except Exception as e:
-            print(f"文本安全处理失败: {e}")
-            safe_text = ""
-        
-        # 将十六进制颜色转换为RGBA元组
-        try:
-            # 移除#号（如果有）
-            color_str = color_str.lstrip('#')
-            # 转换为RGB
-            r = int(color_str[0:2], 16)
-            g = int(color_str[2:4], 16)
-            b = int(color_str[4:6], 16)
-            # 创建RGBA颜色
-            text_color = (r, g, b, opacity)
-            print(f"颜色转换成功: {text_color}")
-        except Exception as e:
-            print(f"颜色转换错误: {e}")
-            # 默认使用白色
-            text_color = (255, 255, 255, opacity)
-            print(f"使用默认白色: {text_color}")
-        
-        # 解析描边颜色
-        try:
-            stroke_color_str = stroke_color_str.lstrip('#')
-            sr = int(stroke_color_str[0:2], 16)
-            sg = int(stroke_color_str[2:4], 16)
-            sb = int(stroke_color_str[4:6], 16)
-            stroke_color = (sr, sg, sb, opacity)
-            print(f"描边颜色转换成功: {stroke_color}")
-        except Exception as e:
-            print(f"描边颜色转换错误: {e}")
-            stroke_color = (0, 0, 0, opacity)
-            print(f"使用默认黑色描边: {stroke_color}")
-        
-        # 尝试加载字体，确保中文能正确显示
-        font = None
-        
-        # 获取粗体和斜体设置
-        bold = settings.get('bold', False)
-        italic = settings.get('italic', False)
-        print(f"字体样式设置: 粗体={bold}, 斜体={italic}")
-        
-        # 根据bold和italic属性构建字体选项列表
-        font_options = []
-        if bold and italic:
-            # 粗斜体
-            font_options = [f"{font_name}:bold:italic", f"{font_name}-BoldItalic"]
-        elif bold:
-            # 粗体
-            font_options = [f"{font_name}:bold", f"{font_name}-Bold"]
-        elif italic:
-            # 斜体
-            font_options = [f"{font_name}:italic", f"{font_name}-Italic"]
-        
-        # 优先使用中文字体
-        chinese_fonts = ['微软雅黑', 'Microsoft YaHei', 'SimHei', 'Arial Unicode MS', 'Arial']
-        
-        # 字体加载策略：先尝试带有样式的字体选项，再尝试用户指定的字体，最后尝试中文字体列表
-        font_to_try = font_options.copy()
-        if font_name and font_name not in font_to_try:
-            font_to_try.append(font_name)
-        font_to_try.extend(chinese_fonts)
-        
-        # Windows系统字体目录
-        windows_font_dirs = ['C:\Windows\Fonts', 'C:\WINNT\Fonts']
-        
-        try:
-            # 先尝试带有样式的字体选项
-            if font_options:
-                print(f"优先尝试带样式的字体选项: {font_options}")
-                for styled_font in font_options:
-                    print(f"尝试加载带样式字体: {styled_font}")
-                    try:
-                        font = ImageFont.truetype(styled_font, font_size)
-                        print(f"成功加载带样式字体: {styled_font}")
-                        break
-                    except Exception as e:
-                        print(f"加载带样式字体失败 {styled_font}: {str(e)}")
-            
-            # 如果带样式的字体加载失败，尝试普通字体
-            if font is None:
-                print("带样式字体加载失败，尝试普通字体")
-                for font_name_try in font_to_try:
-                    # 跳过已经尝试过的带样式字体
-                    if ':' in font_name_try or '-' in font_name_try and any(suffix in font_name_try for suffix in ['Bold', 'Italic']):
-                        continue
-                    
-                    print(f"尝试加载字体: {font_name_try}")
-                    
-                    # 尝试直接加载字体名称
-                    try:
-                        font = ImageFont.truetype(font_name_try, font_size)
-                        print(f"成功加载字体: {font_name_try}")
-                                    # 记录字体样式设置，稍后在绘制时使用
-                        print(f"字体样式设置将在绘制时应用: 粗体={bold}, 斜体={italic}")
-                        break
-                    except:
-                        # 尝试添加.ttf后缀
-                        try:
-                            font = ImageFont.truetype(f"{font_name_try}.ttf", font_size)
-                            print(f"成功加载字体: {font_name_try}.ttf")
-                            break
-                        except:
-                            # 尝试在Windows字体目录中查找
-                            found = False
-                            for font_dir in windows_font_dirs:
-                                if os.path.exists(font_dir):
-                                    font_path = os.path.join(font_dir, f"{font_name_try}.ttf")
-                                    if os.path.exists(font_path):
-                                        try:
-                                            font = ImageFont.truetype(font_path, font_size)
-                                            print(f"成功从系统目录加载字体: {font_path}")
-                                            found = True
-                                            break
-                                        except:
-                                            continue
-                            if found:
-                                break
-        except Exception as e:
-            print(f"字体加载异常: {e}")
-            
-        # 如果所有字体都加载失败，使用默认字体
-        if font is None:
-            print("使用默认字体")
-            font = ImageFont.load_default()
-        
-        # 确保文本不为空
-        if safe_text.strip():
-            # 创建临时图像来绘制文字
-            temp_img = Image.new('RGBA', watermarked.size, (255, 255, 255, 0))
-            temp_draw = ImageDraw.Draw(temp_img)
-                
-            # 获取文本尺寸 - 使用try-except避免编码问题
-            text_width, text_height = 100, 30  # 默认值
-            try:
-                # 使用try-except包装文本尺寸计算
-                try:
-                    # 优先使用textbbox
-                    bbox = temp_draw.textbbox((0, 0), safe_text, font=font)
-                    text_width = bbox[2] - bbox[0]
-                    text_height = bbox[3] - bbox[1]
-                    print(f"文本尺寸计算成功: {text_width}x{text_height}")
-                except Exception as e1:
-                    print(f"textbbox失败: {e1}")
-                    try:
-                        # 尝试使用textsize（旧版本PIL）
-                        text_width, text_height = temp_draw.textsize(safe_text, font=font)
-                        print(f"textsize计算成功: {text_width}x{text_height}")
-                    except Exception as e2:
-                        print(f"textsize也失败: {e2}")
-                        print(f"使用默认文本尺寸: {text_width}x{text_height}")
-            except Exception as e:
-                print(f"文本尺寸计算失败: {e}")
-                print(f"使用默认文本尺寸: {text_width}x{text_height}")
-            
-            # 获取位置设置
-            h_position = settings.get('h_position', 0.5)
-            v_position = settings.get('v_position', 0.5)
-            
-            # 计算水印位置
-            x = max(0, int((watermarked.size[0] - text_width) * h_position))
-            y = max(0, int((watermarked.size[1] - text_height) * v_position))
-            print(f"计算水印位置: ({x}, {y})")
-            
-            # 处理旋转
-            if rotation != 0:
-                print(f"处理旋转: {rotation}度")
-                try:
-                    # 创建一个新的临时图像用于旋转
-                    text_img = Image.new('RGBA', (text_width + 40, text_height + 40), (255, 255, 255, 0))
-                    text_draw = ImageDraw.Draw(text_img)
-                    
-                    # 绘制文本到临时图像 - 注意参数名：color改为fill，stroke_color改为stroke_fill
-                    self._draw_text_with_effects(text_draw, (20, 20), safe_text, font, fill=text_color, 
-                                     shadow=shadow, stroke=stroke, stroke_width=stroke_width, stroke_fill=stroke_color,
-                                     bold=bold, italic=italic)
-                    
-                    # 旋转文本图像
-                    rotated_text = text_img.rotate(rotation, expand=True, fillcolor=(255, 255, 255, 0))
-                    
-                    # 计算旋转后的位置
-                    rot_x = max(0, x - rotated_text.width // 2 + text_width // 2)
-                    rot_y = max(0, y - rotated_text.height // 2 + text_height // 2)
-                    print(f"旋转后位置: ({rot_x}, {rot_y})")
-                    
-                    # 粘贴旋转后的文本到主图像
-                    watermarked.paste(rotated_text, (rot_x, rot_y), rotated_text)
-                except Exception as e:
-                    print(f"旋转处理失败: {e}")
-                    # 降级方案：直接绘制不旋转的文本
-                    print("降级到直接绘制文本")
-                    self._draw_text_with_effects(draw, (x, y), safe_text, font, fill=text_color, 
-                                         shadow=shadow, stroke=stroke, stroke_width=stroke_width, stroke_fill=stroke_color,
-                                         bold=bold, italic=italic)
-            else:
-                # 直接绘制文本到图像，添加效果
-                print("直接绘制文本，无旋转")
-                self._draw_text_with_effects(draw, (x, y), safe_text, font, fill=text_color, 
-                                     shadow=shadow, stroke=stroke, stroke_width=stroke_width, stroke_fill=stroke_color,
-                                     bold=bold, italic=italic)
-        
-        # 如果原始图像不是RGBA模式，转换回原始模式
-        if image.mode != 'RGBA':
-            watermarked = watermarked.convert(image.mode)
-        
-        print("水印应用完成")
-        return watermarked
-    
-    def _draw_text_with_effects(self, draw, position, text, font, fill, shadow=False, stroke=False, stroke_width=2, stroke_fill=(0,0,0,255), bold=False, italic=False):
         """
-        绘制带有效果的文本
+        应用水印到图片上，实际绘制交给核心模块的WatermarkRenderer
         
         Args:
-            draw: ImageDraw对象
-            position: 文本位置 (x, y)
-            text: 要绘制的文本
-            font: ImageFont对象
-            fill: 文本颜色 (RGBA元组)
-            shadow: 是否添加阴影
-            stroke: 是否添加描边
-            stroke_width: 描边宽度
-            stroke_fill: 描边颜色 (RGBA元组)
-            bold: 是否粗体
-            italic: 是否斜体
-        """
-        x, y = position
-        
-        print(f"===== 文本绘制开始（settings_panel）=====")
-        print(f"绘制文本效果: 阴影={shadow}, 描边={stroke}, 描边宽度={stroke_width}, 粗体={bold}, 斜体={italic}")
-        print(f"文本颜色: {fill}, 类型: {type(fill)}")
-        print(f"描边颜色: {stroke_fill}, 类型: {type(stroke_fill)}")
-        
-        # 调整位置用于斜体效果
-        adjusted_x, adjusted_y = x, y
-        if italic:
-            print("应用斜体效果")
-        
-        try:
-            # 绘制阴影
-            if shadow:
-                shadow_color = (0, 0, 0, int(fill[3] * 0.5))  # 半透明黑色阴影
-                print("绘制阴影")
-                if italic:
-                    # 斜体文本的阴影：使用临时图像和仿射变换
-                    text_width, text_height = font.getsize(text)
-                    shadow_img = Image.new('RGBA', (text_width + 20, text_height + 20), (255, 255, 255, 0))
-                    shadow_draw = ImageDraw.Draw(shadow_img)
-                    shadow_draw.text((10, 10), text, font=font, fill=shadow_color)
-                    italic_skew = 0.2
-                    width, height = shadow_img.size
-                    italic_shadow = shadow_img.transform(
-                        (width + int(height * italic_skew), height),
-                        Image.AFFINE,
-                        (1, italic_skew, 0, 0, 1, 0),
-                        fillcolor=(255, 255, 255, 0)
-                    )
-                    # 粘贴斜体阴影到主图像（偏移2像素）
-                    draw.bitmap((adjusted_x + 2, adjusted_y + 2), italic_shadow, fill=None)
-                else:
-                    # 正常文本的阴影
-                    draw.text((adjusted_x + 2, adjusted_y + 2), text, font=font, fill=shadow_color)
-            
-            # 绘制描边
-            if stroke and stroke_fill:
-                print("绘制描边")
-                if italic:
-                    # 斜体文本的描边：使用临时图像和仿射变换
-                    text_width, text_height = font.getsize(text)
-                    stroke_img = Image.new('RGBA', (text_width + 20, text_height + 20), (255, 255, 255, 0))
-                    stroke_draw = ImageDraw.Draw(stroke_img)
-                    # 先绘制描边到临时图像
-                    for offset in range(1, stroke_width + 1):
-                        for dx, dy in [(-offset, 0), (offset, 0), (0, -offset), (0, offset)]:
-                            stroke_draw.text((10 + dx, 10 + dy), text, font=font, fill=stroke_fill)
-                    # 应用斜体变换
-                    italic_skew = 0.2
-                    width, height = stroke_img.size
-                    italic_stroke = stroke_img.transform(
-                        (width + int(height * italic_skew), height),
-                        Image.AFFINE,
-                        (1, italic_skew, 0, 0, 1, 0),
-                        fillcolor=(255, 255, 255, 0)
-                    )
-                    # 粘贴斜体描边到主图像
-                    draw.bitmap((adjusted_x, adjusted_y), italic_stroke, fill=None)
-                else:
-                    # 正常文本的描边
-                    # 只绘制四个方向的描边，避免对角线方向的问题
-                    for offset in range(1, stroke_width + 1):
-                        draw.text((adjusted_x - offset, adjusted_y), text, font=font, fill=stroke_fill)
-                        draw.text((adjusted_x + offset, adjusted_y), text, font=font, fill=stroke_fill)
-                        draw.text((adjusted_x, adjusted_y - offset), text, font=font, fill=stroke_fill)
-                        draw.text((adjusted_x, adjusted_y + offset), text, font=font, fill=stroke_fill)
+            image: PIL Image对象
+            settings: 水印设置字典
             
-            # 绘制文本（结合斜体和粗体效果）
-            print("绘制文本（结合效果）")
-            if italic:
-                # 斜体文本处理（包含粗体效果）
-                # 首先计算文本尺寸
-                text_width, text_height = font.getsize(text)
-                # 创建一个临时图像来绘制文本
-                temp_img = Image.new('RGBA', (text_width + 20, text_height + 20), (255, 255, 255, 0))
-                temp_draw = ImageDraw.Draw(temp_img)
-                
-                # 如果需要粗体，先绘制粗体效果
-                if bold:
-                    print("应用斜体+粗体效果")
-                    bold_offset = 1
-                    # 在临时图像上绘制粗体效果
-                    for dx, dy in [(bold_offset, 0), (-bold_offset, 0), (0, bold_offset), (0, -bold_offset)]:
-                        temp_draw.text((10 + dx, 10 + dy), text, font=font, fill=fill)
-                
-                # 绘制主文本到临时图像
-                temp_draw.text((10, 10), text, font=font, fill=fill)
-                
-                # 创建斜体变换矩阵（向右倾斜）
-                italic_skew = 0.2  # 斜体倾斜系数
-                # 计算变换参数
-                width, height = temp_img.size
-                # 使用仿射变换创建斜体效果
-                italic_img = temp_img.transform(
-                    (width + int(height * italic_skew), height),
-                    Image.AFFINE,
-                    (1, italic_skew, 0, 0, 1, 0),
-                    fillcolor=(255, 255, 255, 0)
-                )
-                
-                # 粘贴斜体文本到主图像
-                draw.bitmap((adjusted_x, adjusted_y), italic_img, fill=None)
-            else:
-                # 非斜体文本处理
-                # 如果需要粗体，先绘制粗体效果
-                if bold:
-                    print("应用粗体效果")
-                    bold_offset = 1
-                    # 在相邻位置绘制文本
-                    for dx, dy in [(bold_offset, 0), (-bold_offset, 0), (0, bold_offset), (0, -bold_offset)]:
-                        draw.text((adjusted_x + dx, adjusted_y + dy), text, font=font, fill=fill)
-                
-                # 绘制主文本
-                draw.text((adjusted_x, adjusted_y), text, font=font, fill=fill)
-            print("文本绘制完成")
-        except Exception as e:
-            print(f"文本绘制异常: {e}")
-            # 降级方案：尝试不使用效果直接绘制
-            try:
-                print("尝试降级绘制")
-                draw.text((x, y), text, font=font, fill=fill)
-            except Exception as e2:
-                print(f"降级绘制也失败: {e2}")
+        Returns:
+            Image: 带水印的图片
+        """
+        return WatermarkRenderer(settings).render(image)
     
     def get_watermark_text(self):
         """
@@ -960,10 +684,8 @@ class SettingsPanel(QWidget):
         """
         # 触发预览更新
         if hasattr(self, 'preview_panel') and self.preview_panel:
-            print(f"DEBUG: 位置发生变化，更新预览和水印判定区域")
             self.preview_panel.update_watermark_preview()
         elif hasattr(self, 'main_window') and hasattr(self.main_window, 'preview_panel'):
-            print(f"DEBUG: 位置发生变化，通过main_window更新预览和水印判定区域")
             self.main_window.preview_panel.update_watermark_preview()
     
     def set_preset_position(self, h_pos, v_pos):
@@ -993,12 +715,28 @@ class SettingsPanel(QWidget):
         # 触发预览更新
         self._on_position_change()
     
+    def set_applied_position(self, h_pos, v_pos):
+        """
+        直接应用水印位置（在预览中拖拽水印后调用），其他已应用的设置保持不变
+        
+        Args:
+            h_pos: 水平位置比例 (0-1)
+            v_pos: 垂直位置比例 (0-1)
+        """
+        self.applied_settings = dict(self.get_applied_settings(), h_position=h_pos, v_position=v_pos)
+        self.template_manager.save_last_settings(self.applied_settings)
+        # 同步位置滑块，滑块变化会触发预览更新
+        self.set_preset_position(int(round(h_pos * 100)), int(round(v_pos * 100)))
+    
     def _get_current_settings(self):
         """
         获取当前界面上的所有设置值
         """
         settings = {
+            'type': 'image' if hasattr(self, 'image_type_radio') and self.image_type_radio.isChecked() else 'text',
             'text': self.watermark_text.text() if hasattr(self, 'watermark_text') else "我的图片",
+            'image_path': getattr(self, 'image_path', ''),
+            'image_scale': self.image_scale_slider.value() if hasattr(self, 'image_scale_slider') else 100,
             'size': self.size_slider.value() if hasattr(self, 'size_slider') else 30,
             'opacity': self.opacity_slider.value() / 100.0 if hasattr(self, 'opacity_slider') else 0.5,
             'rotation': self.rotation_slider.value() if hasattr(self, 'rotation_slider') else 0,
@@ -1032,7 +770,7 @@ class SettingsPanel(QWidget):
         self.applied_settings = self._get_current_settings()
         # 保存为最后使用的设置
         self.template_manager.save_last_settings(self.applied_settings)
-        print(f"设置已应用: {self.applied_settings}")
+        logger.debug("设置已应用: %s", self.applied_settings)
         return self.applied_settings
     
     def load_initial_settings(self):
@@ -0,0 +1,88 @@
+# src/gui/thumbnail_loader.py
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from src.core.image_cache import IMAGE_CACHE
+from src.core.thumbnail_cache import THUMBNAIL_CACHE
+from src.gui.qt_image import pil_to_qimage
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ThumbnailSignals(QObject):
+    """缩略图加载完成信号，工作线程发出，GUI线程接收"""
+    # 图片路径, 缩略图QImage（加载失败时为None）
+    thumbnail_ready = pyqtSignal(str, object)
+
+
+class ThumbnailTask(QRunnable):
+    """在线程池中缩小解码单张图片的缩略图"""
+
+    def __init__(self, file_path, size, signals):
+        """
+        Args:
+            file_path: 图片路径
+            size: 缩略图最大尺寸 (width, height)
+            signals: 用于回传结果的ThumbnailSignals
+        """
+        super().__init__()
+        self.file_path = file_path
+        self.size = size
+        self.signals = signals
+
+    def run(self):
+        """线程入口：获取缩略图并转换为QImage（QPixmap只能在GUI线程创建）"""
+        q_image = None
+        try:
+            # 依次查找内存缓存、磁盘缩略图缓存，都没有时才解码原图
+            thumbnail = IMAGE_CACHE.get_or_load(
+                self.file_path, ('thumbnail', self.size),
+                lambda path: THUMBNAIL_CACHE.load(path, self.size))
+            if thumbnail is not None:
+                q_image = pil_to_qimage(thumbnail)
+        except Exception as e:
+            logger.warning("生成缩略图失败 %s: %s", self.file_path, e)
+        self.signals.thumbnail_ready.emit(self.file_path, q_image)
+
+
+class ThumbnailLoader(QObject):
+    """
+    异步缩略图加载器
+
+    请求在专用线程池中处理，最新提交的请求优先（快速滚动时先加载当前可见的行），
+    结果通过thumbnail_ready信号逐个返回。
+    """
+    thumbnail_ready = pyqtSignal(str, object)
+
+    def __init__(self, size, parent=None):
+        """
+        Args:
+            size: 缩略图最大尺寸 (width, height)
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.size = tuple(size)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max(2, QThreadPool.globalInstance().maxThreadCount()))
+        self._signals = ThumbnailSignals(self)
+        # 后提交的请求优先处理，快速滚动时先加载当前可见的行
+        self._priority = 0
+        self._signals.thumbnail_ready.connect(self.thumbnail_ready)
+
+    def request(self, file_path):
+        """
+        提交缩略图加载请求
+
+        Args:
+            file_path: 图片路径
+        """
+        self._priority += 1
+        self._pool.start(ThumbnailTask(file_path, self.size, self._signals), self._priority)
+
+    def clear(self):
+        """撤销尚未开始的请求"""
+        self._pool.clear()
+
+    def wait(self, msecs=-1):
+        """等待所有请求完成（关闭程序时使用）"""
+        return self._pool.waitForDone(msecs)
@@ -0,0 +1,230 @@
+# src/main/cli.py
+"""
+命令行批量添加水印，不依赖PyQt5，可在无图形界面的服务器上运行
+
+示例:
+    python -m src.main.cli photos/ extra.jpg -o out/ --template 默认 --format JPEG --quality 85 --resize width:1920 --jobs 4
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from src.core.batch_exporter import BatchExporter
+from src.core.file_handler import FileHandler
+from src.core.template_manager import TemplateManager
+from src.utils.logger import setup_logging
+
+
+# 未指定模板或设置文件时使用的水印设置，与界面的默认值一致
+DEFAULT_WATERMARK_SETTINGS = {
+    'type': 'text',
+    'text': "我的图片",
+    'image_path': '',
+    'image_scale': 100,
+    'size': 30,
+    'opacity': 0.5,
+    'rotation': 0,
+    'color': '#FFFFFF',
+    'font': '微软雅黑',
+    'h_position': 0.5,
+    'v_position': 0.5,
+    'style': 'single',
+    'spacing': 50,
+}
+
+
+def collect_images(inputs):
+    """
+    将输入的文件和文件夹展开为图片路径列表（去重，保持顺序）
+
+    Args:
+        inputs: 文件或文件夹路径列表
+
+    Returns:
+        list: 图片路径列表
+    """
+    image_paths = []
+    seen = set()
+    for path in inputs:
+        if os.path.isdir(path):
+            candidates = FileHandler.get_images_from_folder(path)
+        elif os.path.isfile(path) and FileHandler.is_supported_image(path):
+            candidates = [path]
+        else:
+            print(f"跳过不支持的输入: {path}", file=sys.stderr)
+            continue
+        for candidate in candidates:
+            key = os.path.normcase(os.path.abspath(candidate))
+            if key not in seen:
+                seen.add(key)
+                image_paths.append(candidate)
+    return image_paths
+
+
+def parse_resize(value):
+    """
+    解析尺寸调整规则
+
+    Args:
+        value: 'original'、'width:800'、'height:600' 或 'percent:50'
+
+    Returns:
+        dict: resize_type, width, height, percent
+    """
+    resize = {'resize_type': 'original', 'width': None, 'height': None, 'percent': None}
+    if value == 'original':
+        return resize
+    kind, _, amount = value.partition(':')
+    if kind not in ('width', 'height', 'percent') or not amount:
+        raise argparse.ArgumentTypeError(f"无效的尺寸规则: {value}（应为 original、width:N、height:N 或 percent:N）")
+    try:
+        number = float(amount) if kind == 'percent' else int(amount)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无效的尺寸数值: {amount}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"尺寸数值必须大于0: {amount}")
+    resize['resize_type'] = kind
+    resize[kind] = number
+    return resize
+
+
+def load_watermark_settings(args):
+    """
+    根据命令行参数确定水印设置：模板或JSON文件，再叠加 --text、--logo 覆盖
+
+    Returns:
+        dict: 水印设置字典，加载失败时返回None
+    """
+    settings = dict(DEFAULT_WATERMARK_SETTINGS)
+    if args.template:
+        template = TemplateManager().load_template(args.template)
+        if template is None:
+            print(f"找不到模板: {args.template}", file=sys.stderr)
+            return None
+        settings.update(template)
+    elif args.settings:
+        try:
+            with open(args.settings, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"读取设置文件失败: {e}", file=sys.stderr)
+            return None
+        # 兼容直接保存的设置与模板文件（设置位于'settings'字段中）
+        settings.update(data.get('settings', data) if isinstance(data, dict) else {})
+    if args.text is not None:
+        settings['text'] = args.text
+    if args.logo is not None:
+        settings['type'] = 'image'
+        settings['image_path'] = args.logo
+        if args.logo_scale is not None:
+            settings['image_scale'] = args.logo_scale
+    return settings
+
+
+def build_parser():
+    """创建命令行参数解析器"""
+    parser = argparse.ArgumentParser(
+        prog='python -m src.main.cli',
+        description='批量为图片添加文本或图片水印（无图形界面）')
+    parser.add_argument('inputs', nargs='+', help='图片文件或文件夹（递归查找）')
+    parser.add_argument('-o', '--output', required=True, help='输出文件夹')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('-t', '--template', help='使用已保存的水印模板名称')
+    source.add_argument('-s', '--settings', help='水印设置JSON文件（设置字典或模板文件）')
+    parser.add_argument('--text', help='覆盖水印文本')
+    parser.add_argument('--logo', help='使用图片水印（如PNG格式的Logo）代替文本')
+    parser.add_argument('--logo-scale', type=float, help='图片水印缩放百分比（默认100）')
+    parser.add_argument('-f', '--format', choices=['JPEG', 'PNG'], type=str.upper, default='PNG',
+                        help='输出格式（默认PNG）')
+    parser.add_argument('-q', '--quality', type=int, default=90, help='JPEG质量 0-100（默认90）')
+    parser.add_argument('-r', '--resize', type=parse_resize, default=parse_resize('original'),
+                        help='尺寸调整: original、width:N、height:N、percent:N（默认original）')
+    parser.add_argument('--naming', choices=['original', 'prefix', 'suffix'], default='suffix',
+                        help='输出文件命名规则（默认suffix）')
+    parser.add_argument('--prefix', default='wm_', help='命名前缀（默认wm_）')
+    parser.add_argument('--suffix', default='_watermark', help='命名后缀（默认_watermark）')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='并行进程数（默认等于CPU核心数，1为单进程）')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='输出调试日志（也可通过环境变量PHOTO_WATERMARK_LOG_LEVEL设置级别）')
+    return parser
+
+
+def main(argv=None):
+    """
+    命令行入口
+
+    Returns:
+        int: 退出码（0全部成功，1有图片失败，2参数错误）
+    """
+    args = build_parser().parse_args(argv)
+    setup_logging('DEBUG' if args.verbose else None)
+
+    watermark_settings = load_watermark_settings(args)
+    if watermark_settings is None:
+        return 2
+
+    image_paths = collect_images(args.inputs)
+    if not image_paths:
+        print("没有找到可处理的图片", file=sys.stderr)
+        return 2
+
+    # 保留原文件名时不允许写回原始文件夹，避免覆盖原图
+    output_dir = os.path.abspath(args.output)
+    if args.naming == 'original':
+        original_dirs = set(os.path.normcase(os.path.abspath(os.path.dirname(p))) for p in image_paths)
+        if os.path.normcase(output_dir) in original_dirs:
+            print("使用原文件名时，输出文件夹不能是原始图片所在的文件夹", file=sys.stderr)
+            return 2
+
+    export_settings = {
+        'format': args.format,
+        'quality': max(0, min(100, args.quality)),
+        'naming_rule': args.naming,
+        'prefix': args.prefix,
+        'suffix': args.suffix,
+    }
+    export_settings.update(args.resize)
+    watermark_settings['format'] = args.format
+
+    try:
+        exporter = BatchExporter(watermark_settings, export_settings, output_dir,
+                                 max_workers=max(1, args.jobs) if args.jobs else None)
+    except (OSError, ValueError) as e:
+        print(f"水印设置无效: {e}", file=sys.stderr)
+        return 2
+
+    # 导出前只读文件头，提前报告无法处理的文件和资源需求
+    estimate = exporter.estimate(image_paths)
+    print(f"共 {estimate.count + estimate.rejected} 张图片，无法处理 {estimate.rejected} 张，"
+          f"合计 {estimate.megapixels:.1f} 百万像素，预计内存峰值 {estimate.peak_memory / 1024 / 1024:.0f} MB")
+
+    total = len(image_paths)
+    done = 0
+    failures = 0
+    start = time.perf_counter()
+    try:
+        for result in exporter.iter_results(image_paths):
+            done += 1
+            if result.success:
+                print(f"[{done}/{total}] {result.image_path} -> {result.output_path}")
+            else:
+                failures += 1
+                print(f"[{done}/{total}] 失败 {result.image_path}: {result.error}", file=sys.stderr)
+    except KeyboardInterrupt:
+        exporter.cancel()
+        print("已中断", file=sys.stderr)
+        return 1
+
+    elapsed = time.perf_counter() - start
+    print(f"完成: 成功 {done - failures}/{total} 张，失败 {failures} 张，用时 {elapsed:.1f} 秒")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    # 打包后的程序使用进程池时需要
+    multiprocessing.freeze_support()
+    sys.exit(main())
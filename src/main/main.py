@@ -1,36 +1,39 @@
 # src/main/main.py
 # 强制使用UTF-8编码
 import sys
-import io
 import os
 import locale
-
-# 打印当前环境信息用于调试
-print(f"系统编码: {sys.getdefaultencoding()}")
-print(f"文件系统编码: {sys.getfilesystemencoding()}")
-print(f"区域设置: {locale.getpreferredencoding()}")
+import multiprocessing
 
 # 设置环境变量以确保UTF-8编码
 os.environ['PYTHONIOENCODING'] = 'utf-8'
 
-# 强制使用UTF-8编码，添加errors='replace'以避免打印时的编码错误
+# 强制使用UTF-8编码，添加errors='replace'以避免输出时的编码错误
+# 直接重新配置原有的流，不再额外包装一层TextIOWrapper
 # 添加检查，确保stdout和stderr不为None（在--windowed模式下可能为None）
-if sys.stdout is not None:
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-if sys.stderr is not None:
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+for stream in (sys.stdout, sys.stderr):
+    if stream is not None and hasattr(stream, 'reconfigure'):
+        stream.reconfigure(encoding='utf-8', errors='replace')
 
 # 导入必要的模块
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import Qt, QLocale
 from PyQt5.QtGui import QFont
 from src.gui.main_window import MainWindow
+from src.utils.logger import get_logger, setup_logging
+
+# 作为脚本运行时__name__为__main__，使用固定名称归入src日志器
+logger = get_logger('src.main.main')
 
 def main():
     """
     应用程序入口函数
     """
-    print("初始化应用程序...")
+    setup_logging()
+    # 输出当前环境信息用于调试
+    logger.debug("系统编码: %s, 文件系统编码: %s, 区域设置: %s",
+                 sys.getdefaultencoding(), sys.getfilesystemencoding(), locale.getpreferredencoding())
+    logger.info("初始化应用程序...")
     
     # 创建Qt应用程序实例
     app = QApplication(sys.argv)
@@ -46,13 +49,13 @@ def main():
     app.setStyle("Fusion")
     
     # 设置全局字体（支持中文显示）
-    print("设置全局字体...")
+    logger.debug("设置全局字体...")
     font = QFont()
     font.setFamily("微软雅黑")
     app.setFont(font)
     
     # 创建并显示主窗口
-    print("创建主窗口...")
+    logger.debug("创建主窗口...")
     window = MainWindow()
     
     # 显示窗口
@@ -60,12 +63,14 @@ def main():
     
     # 运行应用程序主循环
     try:
-        print("启动应用程序主循环...")
+        logger.info("启动应用程序主循环...")
         sys.exit(app.exec_())
     except Exception as e:
-        print(f"应用程序退出时出错: {type(e).__name__}: {e}")
+        logger.exception("应用程序退出时出错: %s", e)
         sys.exit(1)
 
 
 if __name__ == "__main__":
+    # 打包后的程序使用进程池批量导出时需要
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
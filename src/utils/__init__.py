@@ -0,0 +1,8 @@
+# src/utils/__init__.py
+"""
+通用工具模块
+"""
+
+from .logger import get_logger, setup_logging
+
+__all__ = ['get_logger', 'setup_logging']
@@ -0,0 +1,119 @@
+# src/utils/logger.py
+"""
+日志子系统
+
+各模块通过 get_logger(__name__) 获取自己的日志器，并使用 %s 占位符记录日志，
+级别未开启时不会格式化消息。日志记录先放入队列，由后台线程写到控制台或文件，
+调用方不会阻塞在控制台编码和磁盘写入上。
+
+环境变量:
+    PHOTO_WATERMARK_LOG_LEVEL: 日志级别（DEBUG、INFO、WARNING、ERROR），默认INFO
+    PHOTO_WATERMARK_LOG_FILE: 同时写入的日志文件路径（窗口模式下没有控制台时使用）
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+# 所有模块日志器的公共父日志器（模块名均以src.开头）
+ROOT_LOGGER_NAME = 'src'
+LOG_LEVEL_ENV = 'PHOTO_WATERMARK_LOG_LEVEL'
+LOG_FILE_ENV = 'PHOTO_WATERMARK_LOG_FILE'
+DEFAULT_LEVEL = logging.INFO
+LOG_FORMAT = '%(asctime)s %(levelname)s [%(processName)s/%(threadName)s] %(name)s: %(message)s'
+
+# 当前进程的后台输出线程及其所属进程号
+_listener = None
+_listener_pid = None
+
+
+def get_logger(name):
+    """
+    获取模块日志器
+
+    Args:
+        name: 模块名，一般传入__name__
+
+    Returns:
+        logging.Logger: 日志器
+    """
+    return logging.getLogger(name)
+
+
+def _resolve_level(level):
+    """将级别名称或数值解析为logging级别，无效时使用默认级别"""
+    if level is None:
+        level = os.environ.get(LOG_LEVEL_ENV) or DEFAULT_LEVEL
+    if isinstance(level, str):
+        level = logging.getLevelName(level.strip().upper())
+    return level if isinstance(level, int) else DEFAULT_LEVEL
+
+
+def _create_output_handlers():
+    """创建后台线程使用的输出处理器"""
+    handlers = []
+    # 打包为窗口程序时没有控制台，sys.stderr为None
+    if sys.stderr is not None:
+        handlers.append(logging.StreamHandler(sys.stderr))
+    log_file = os.environ.get(LOG_FILE_ENV)
+    if log_file:
+        try:
+            handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+        except OSError as e:
+            if sys.stderr is not None:
+                sys.stderr.write(f"无法打开日志文件 {log_file}: {e}\n")
+    if not handlers:
+        handlers.append(logging.NullHandler())
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def setup_logging(level=None):
+    """
+    配置日志输出，可重复调用（已配置时只调整级别）
+
+    Args:
+        level: 日志级别（名称或数值），为None时读取环境变量PHOTO_WATERMARK_LOG_LEVEL
+
+    Returns:
+        logging.Logger: 所有模块日志器的父日志器
+    """
+    global _listener, _listener_pid
+
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    root.setLevel(_resolve_level(level))
+    if _listener is not None and _listener_pid == os.getpid():
+        return root
+
+    # fork出的子进程继承了父进程的队列处理器，但没有对应的后台线程，需要重新配置
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    log_queue = queue.SimpleQueue()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, *_create_output_handlers(),
+                                               respect_handler_level=True)
+    _listener.start()
+    _listener_pid = os.getpid()
+    return root
+
+
+def shutdown_logging():
+    """停止后台输出线程，并输出队列中剩余的日志"""
+    global _listener, _listener_pid
+    if _listener is not None and _listener_pid == os.getpid():
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+    _listener = None
+    _listener_pid = None
+
+
+atexit.register(shutdown_logging)